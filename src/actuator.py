@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Motor actuator thread with a latest-wins mailbox.
+
+Control posts wheel commands; a dedicated thread applies them to the
+hardware. The mailbox holds a single command: posting while the previous
+one is still waiting overwrites it (and counts it as dropped), so a slow
+backend (e.g. a pigpio socket round trip) never makes commands queue up
+and the motors always get the newest stick position. post() only takes a
+short lock and never touches the hardware.
+"""
+import threading
+import time
+
+from latency import LatencyHistogram
+
+
+class Actuator:
+    """Apply WheelDrive commands on a separate thread, latest command wins."""
+
+    def __init__(self, wheels, lock=None, name="actuator"):
+        # 'lock' is held while a command is applied (shared with other writers)
+        self.wheels = wheels
+        self.lock = lock or threading.Lock()
+        self.name = name
+
+        self._cond = threading.Condition(threading.Lock())
+        self._slot = [0, 0, 0, 0]
+        self._posted_ns = 0
+        self._pending = False
+        self._stop = False
+        self._thread = None
+
+        self.posted = 0
+        self.applied = 0
+        self.dropped = 0          # superseded before the thread picked them up
+        self.discarded = 0        # cancelled by discard() (hard stops)
+        self.wait = LatencyHistogram("post→apply")
+
+    def post(self, fl, fr, rl, rr):
+        """Hand over a wheel command, replacing any command still waiting."""
+        with self._cond:
+            if self._pending:
+                self.dropped += 1
+            slot = self._slot
+            slot[0] = fl
+            slot[1] = fr
+            slot[2] = rl
+            slot[3] = rr
+            self._posted_ns = time.monotonic_ns()
+            self._pending = True
+            self.posted += 1
+            self._cond.notify()
+
+    @property
+    def moving(self):
+        """The latest posted command moves a wheel, or the wheels still run."""
+        return any(self._slot) or self.wheels.moving
+
+    def discard(self):
+        """
+        Cancel the waiting command: the wheels are being stopped directly.
+        Call with 'lock' held, before the hard stop.
+        """
+        with self._cond:
+            if self._pending:
+                self._pending = False
+                self.discarded += 1
+            slot = self._slot
+            slot[0] = slot[1] = slot[2] = slot[3] = 0
+
+    def start(self):
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        print("[ACTUATOR] Motor commands applied on their own thread")
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self):
+        wheels = self.wheels
+        command = wheels.command
+        cond = self._cond
+
+        while True:
+            with cond:
+                while not self._pending and not self._stop:
+                    cond.wait()
+                if self._stop:
+                    return
+
+            with self.lock:
+                with cond:
+                    if not self._pending:
+                        continue      # discarded by a hard stop meanwhile
+                    command[:] = self._slot
+                    posted_ns = self._posted_ns
+                    self._pending = False
+                try:
+                    wheels.apply()
+                except Exception as e:
+                    print(f"[ACTUATOR] Motor write error: {e}")
+            self.applied += 1
+            self.wait.record(time.monotonic_ns() - posted_ns)
+
+    def report(self):
+        print(f"[ACTUATOR] {self.posted} commands posted, {self.applied} applied, "
+              f"{self.dropped} dropped as superseded, {self.discarded} discarded by stops")
+        print("[ACTUATOR]   " + self.wait.summary())
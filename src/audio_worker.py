@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+DFPlayer command queue drained by its own thread.
+
+Audio actions block: the first one waits seconds for the module to boot,
+and a serial error sleeps before reopening the port. Control only posts
+(fn, args) to the queue and returns at once; the worker runs the actions
+one by one, in order, so a slow DFPlayer delays the audio, never the
+motors. post() is thread-safe and never blocks (asyncio runtime included).
+
+If the queue is full (the DFPlayer is stuck), new actions are dropped
+and counted. The report shows the deepest the queue got and two
+latencies per action: queued→start (time waiting behind others) and
+queued→done.
+"""
+import queue
+import threading
+import time
+
+from latency import LatencyHistogram
+
+DEFAULT_MAX_QUEUE = 16
+
+
+class AudioWorker:
+    """Run posted audio actions on a dedicated thread, in order."""
+
+    def __init__(self, max_queue=DEFAULT_MAX_QUEUE, name="dfplayer"):
+        self.name = name
+        self._queue = queue.Queue(max_queue)
+        self._thread = None
+        self.current_queued_ns = None   # when the running action was posted
+
+        self.posted = 0
+        self.done = 0
+        self.failed = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.wait = LatencyHistogram("queued→start")
+        self.total = LatencyHistogram("queued→done")
+
+    def post(self, fn, *args):
+        """Queue 'fn(*args)'; returns False if it was dropped (queue full)."""
+        try:
+            self._queue.put_nowait((fn, args, time.monotonic_ns()))
+        except queue.Full:
+            self.dropped += 1
+            print(f"[AUDIO] Queue full ({self._queue.maxsize}), action dropped")
+            return False
+        self.posted += 1
+        depth = self._queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return True
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """
+        Drop what is still queued and let the current action finish (up to
+        'timeout'); a DFPlayer still booting is left to its daemon thread.
+        """
+        if self._thread is None:
+            return
+        skipped = 0
+        while True:
+            try:
+                self._queue.get_nowait()
+                skipped += 1
+            except queue.Empty:
+                break
+        if skipped:
+            print(f"[AUDIO] {skipped} queued actions skipped at exit")
+        self._queue.put((None, (), 0))
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            fn, args, queued_ns = self._queue.get()
+            if fn is None:
+                return
+            start = time.monotonic_ns()
+            self.current_queued_ns = queued_ns
+            try:
+                fn(*args)
+                self.done += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"[DFPLAYER] Action error (ignored): {e}")
+            end = time.monotonic_ns()
+            self.wait.record(start - queued_ns)
+            self.total.record(end - queued_ns)
+
+    def report(self):
+        if self.posted == 0 and self.dropped == 0:
+            return
+        print(f"[AUDIO] {self.posted} actions queued, {self.done} done, "
+              f"{self.failed} failed, {self.dropped} dropped (queue full), "
+              f"max queue depth {self.max_depth}")
+        print("[AUDIO]   " + self.wait.summary())
+        print("[AUDIO]   " + self.total.summary())
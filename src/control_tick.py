@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Fixed-rate control tick scheduler.
+
+Runs a callback at a constant rate on its own thread, independent of when
+DS4 events arrive. Deadlines stay on a fixed grid (next = previous +
+period) so timing errors do not accumulate; ticks that cannot be made in
+time are counted as overruns and skipped instead of being run late in a
+burst. Tick jitter is the lateness of each tick against its deadline.
+"""
+import threading
+import time
+
+
+class ControlTicker:
+    """Call 'tick_fn(now_ns)' at 'rate_hz' on a dedicated thread."""
+
+    def __init__(self, rate_hz, tick_fn, name="control-tick"):
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be > 0")
+        self.rate_hz = rate_hz
+        self.period_ns = int(1_000_000_000 / rate_hz)
+        self.tick_fn = tick_fn
+        self.name = name
+
+        self.ticks = 0
+        self.overruns = 0         # deadlines skipped because a tick ran too long
+        self.late_sum_ns = 0
+        self.late_max_ns = 0
+        self.busy_max_ns = 0      # longest tick_fn run
+
+        self._stop = False
+        self._thread = None
+
+    def start(self):
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        print(f"[TICK] Control loop running at {self.rate_hz} Hz")
+
+    def stop(self):
+        self._stop = True
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _run(self):
+        period = self.period_ns
+        next_ns = time.monotonic_ns() + period
+
+        while not self._stop:
+            delay = next_ns - time.monotonic_ns()
+            if delay > 0:
+                time.sleep(delay / 1e9)
+
+            now = time.monotonic_ns()
+            late = now - next_ns
+            self.ticks += 1
+            self.late_sum_ns += late
+            if late > self.late_max_ns:
+                self.late_max_ns = late
+
+            try:
+                self.tick_fn(now)
+            except Exception as e:
+                print(f"[TICK] Control tick error: {e}")
+
+            end = time.monotonic_ns()
+            if end - now > self.busy_max_ns:
+                self.busy_max_ns = end - now
+
+            next_ns += period
+            if end > next_ns:
+                # Overrun: drop the deadlines we already missed, stay on the grid
+                missed = (end - next_ns) // period + 1
+                self.overruns += missed
+                next_ns += missed * period
+
+    def report(self):
+        if self.ticks == 0:
+            return
+        avg_us = self.late_sum_ns / self.ticks / 1e3
+        print(f"[TICK] {self.ticks} ticks at {self.rate_hz} Hz, "
+              f"{self.overruns} overruns, jitter avg {avg_us:.1f} us / "
+              f"max {self.late_max_ns / 1e3:.1f} us, "
+              f"longest tick {self.busy_max_ns / 1e3:.1f} us")
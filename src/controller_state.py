@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Fixed-slot DS4 controller state.
+
+Only the axes and buttons the robot actually uses get a slot in a
+preallocated int array. Every update sets a bit in 'changed', so each
+frame can tell which inputs moved without comparing whole dicts.
+"""
+from array import array
+
+# ======================================================
+#                  LINUX INPUT CODES
+# ======================================================
+
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_ABS = 0x03
+
+SYN_REPORT = 0
+SYN_DROPPED = 3
+
+ABS_Y = 0x01
+ABS_Z = 0x02
+ABS_RY = 0x04
+ABS_RZ = 0x05
+ABS_HAT0X = 0x10
+ABS_HAT0Y = 0x11
+
+BTN_NORTH = 0x133   # Triangle
+BTN_SHARE = 314
+BTN_OPTIONS = 315
+
+# ======================================================
+#                        SLOTS
+# ======================================================
+
+LY = 0         # left stick Y
+RY = 1         # right stick Y
+L2 = 2         # left trigger
+R2 = 3         # right trigger
+HAT_X = 4      # D-pad X (-1, 0, 1)
+HAT_Y = 5      # D-pad Y (-1, 0, 1)
+TRIANGLE = 6
+SHARE = 7
+OPTIONS = 8
+
+NUM_SLOTS = 9
+
+# Resting value of each slot (sticks centered, triggers and buttons released)
+DEFAULTS = (127, 127, 0, 0, 0, 0, 0, 0, 0)
+
+ABS_SLOTS = {
+    ABS_Y: LY,
+    ABS_RY: RY,
+    ABS_Z: L2,
+    ABS_RZ: R2,
+    ABS_HAT0X: HAT_X,
+    ABS_HAT0Y: HAT_Y,
+}
+
+KEY_SLOTS = {
+    BTN_NORTH: TRIANGLE,
+    BTN_SHARE: SHARE,
+    BTN_OPTIONS: OPTIONS,
+}
+
+# Changed-mask bits
+BIT_LY = 1 << LY
+BIT_RY = 1 << RY
+BIT_L2 = 1 << L2
+BIT_R2 = 1 << R2
+BIT_HAT_X = 1 << HAT_X
+BIT_HAT_Y = 1 << HAT_Y
+BIT_TRIANGLE = 1 << TRIANGLE
+BIT_SHARE = 1 << SHARE
+BIT_OPTIONS = 1 << OPTIONS
+
+MOTION_BITS = BIT_LY | BIT_RY | BIT_L2 | BIT_R2
+SHUTDOWN_BITS = BIT_SHARE | BIT_OPTIONS
+ALL_BITS = (1 << NUM_SLOTS) - 1
+
+# Axis codes of the stick / trigger slots in MOTION_BITS
+MOTION_AXES = frozenset(code for code, slot in ABS_SLOTS.items()
+                        if MOTION_BITS & (1 << slot))
+
+
+class ControllerState:
+    """
+    Latest DS4 values in fixed slots plus a bitmask of changed slots.
+    Read fields directly with 'state.values[LY]' and friends.
+    """
+
+    __slots__ = ("values", "changed")
+
+    def __init__(self):
+        self.values = array("i", DEFAULTS)
+        self.changed = ALL_BITS
+
+    def reset(self):
+        """Back to the resting state; every slot is reported as changed."""
+        for slot, value in enumerate(DEFAULTS):
+            self.values[slot] = value
+        self.changed = ALL_BITS
+
+    def update(self, etype, code, value):
+        """
+        Store one EV_ABS / EV_KEY event.
+        Returns True if it hit a tracked slot and changed its value.
+        """
+        if etype == EV_ABS:
+            slot = ABS_SLOTS.get(code)
+        elif etype == EV_KEY:
+            slot = KEY_SLOTS.get(code)
+        else:
+            return False
+
+        if slot is None or self.values[slot] == value:
+            return False
+
+        self.values[slot] = value
+        self.changed |= 1 << slot
+        return True
+
+    def take_changed(self):
+        """Return the changed-mask accumulated since the last call and clear it."""
+        mask = self.changed
+        self.changed = 0
+        return mask
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Axis-to-duty curves for the DS4 sticks and triggers.
+
+Every mapping is baked into a 256-entry table indexed by the raw 0–255
+axis value, so the control loop does a single lookup per axis instead of
+float math. Deadzone, thresholds, duty floor and the optional expo curve
+are all applied when the tables are built.
+
+The mecanum mixer uses integer (fixed-point) tables instead: axis values
+in FIXED_ONE units in, and a duty for each wheel magnitude out.
+
+Two duty scales are supported:
+- PERCENT: 0–100, for RPi.GPIO ChangeDutyCycle
+- PIGPIO:  0–1_000_000, for pigpio hardware_PWM (with a 30% floor so the
+           motors never get a duty too low to turn)
+"""
+
+AXIS_MAX = 255
+
+# Stick deadzone: raw values in [STICK_LOW, STICK_HIGH] mean "stop"
+STICK_LOW = 120    # below → forward
+STICK_HIGH = 140   # above → backward
+
+PERCENT = "percent"
+PIGPIO = "pigpio"
+
+# scale -> (duty for the smallest non-zero input, duty at full input)
+SCALES = {
+    PERCENT: (0.0, 100.0),
+    PIGPIO: (300_000, 1_000_000),
+}
+
+
+def _expo(m, expo):
+    """Blend linear and cubic response (expo=0 linear, expo=1 fully cubic)."""
+    return (1.0 - expo) * m + expo * m * m * m
+
+
+def _duty(m, scale, expo):
+    """Map a normalized magnitude 0..1 to the duty scale."""
+    lo, hi = SCALES[scale]
+    d = lo + _expo(m, expo) * (hi - lo)
+    if scale == PIGPIO:
+        return int(d)
+    return d
+
+
+def stick_table(scale=PERCENT, expo=0.0, low=STICK_LOW, high=STICK_HIGH):
+    """
+    Signed duty for each raw stick value.
+    Positive = forward (stick pushed up), negative = backward, 0 = deadzone.
+    """
+    if scale not in SCALES:
+        raise ValueError(f"Unknown duty scale: {scale}")
+
+    table = []
+    for raw in range(AXIS_MAX + 1):
+        if raw < low:
+            table.append(_duty((low - raw) / low, scale, expo))
+        elif raw > high:
+            table.append(-_duty((raw - high) / (AXIS_MAX - high), scale, expo))
+        else:
+            table.append(0)
+    return tuple(table)
+
+
+def trigger_table(scale=PERCENT, expo=0.0):
+    """Duty for each raw trigger value (0 = released → duty 0)."""
+    if scale not in SCALES:
+        raise ValueError(f"Unknown duty scale: {scale}")
+
+    table = [0]
+    for raw in range(1, AXIS_MAX + 1):
+        table.append(_duty(raw / AXIS_MAX, scale, expo))
+    return tuple(table)
+
+
+# ======================================================
+#            FIXED-POINT TABLES (MECANUM MIXER)
+# ======================================================
+
+FIXED_ONE = 1 << 12    # 1.0 in the mixer's integer axis and wheel units
+
+
+def stick_fixed_table(expo=0.0, low=STICK_LOW, high=STICK_HIGH):
+    """Signed stick value in FIXED_ONE units for each raw value, > 0 forward."""
+    table = []
+    for raw in range(AXIS_MAX + 1):
+        if raw < low:
+            m = (low - raw) / low
+        elif raw > high:
+            m = -(raw - high) / (AXIS_MAX - high)
+        else:
+            m = 0.0
+        table.append(round(_expo(m, expo) * FIXED_ONE))
+    return tuple(table)
+
+
+def trigger_fixed_table(expo=0.0):
+    """Trigger value in FIXED_ONE units for each raw value (0 = released)."""
+    return tuple(round(_expo(raw / AXIS_MAX, expo) * FIXED_ONE)
+                 for raw in range(AXIS_MAX + 1))
+
+
+def magnitude_table(scale=PERCENT):
+    """Duty for each wheel magnitude 0..FIXED_ONE (0 → duty 0)."""
+    if scale not in SCALES:
+        raise ValueError(f"Unknown duty scale: {scale}")
+
+    table = [0]
+    for m in range(1, FIXED_ONE + 1):
+        table.append(_duty(m / FIXED_ONE, scale, 0.0))
+    return tuple(table)
+
+
+class DutyTables:
+    """Per-axis lookup tables for one duty scale."""
+
+    def __init__(self, scale=PERCENT, stick_expo=0.0, trigger_expo=0.0):
+        self.scale = scale
+        self.ly = stick_table(scale, stick_expo)
+        self.ry = stick_table(scale, stick_expo)
+        self.l2 = trigger_table(scale, trigger_expo)
+        self.r2 = trigger_table(scale, trigger_expo)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+DFPlayer Mini / MP3-TF-16P serial protocol helpers.
+
+Frames are 10 bytes: 7E FF 06 CMD FEEDBACK PARAM_H PARAM_L SUM_H SUM_L EF
+(some clones drop the checksum: 8 bytes). Besides answering queries, the
+module reports on its own:
+- 0x3F  initialization done, PARAM_L = online devices (0x02 = SD card);
+        sent once at power-up, and as the answer to a 0x3F query
+- 0x3A  storage inserted (0x02 = SD card)
+- 0x40  error (0x01 = busy: still initializing)
+
+wait_ready() uses them instead of a blind boot delay: it keeps asking
+with 0x3F until the module answers (or announces itself), and falls back
+to a timeout when nothing answers (no RX wire, module without feedback).
+"""
+import time
+
+START = 0x7E
+VERSION = 0xFF
+LENGTH = 0x06
+END = 0xEF
+
+CMD_PLAY_TRACK = 0x03
+CMD_SET_VOLUME = 0x06
+CMD_STOP = 0x16
+CMD_INSERTED = 0x3A
+CMD_QUERY_INIT = 0x3F
+CMD_ERROR = 0x40
+
+DEVICE_SD = 0x02
+
+READY_TIMEOUT = 3.0   # the old fixed boot delay: upper bound of the wait
+QUERY_EVERY = 0.5     # re-send the 0x3F query while nothing answered
+
+
+def build_frame(cmd, param, feedback=0x00):
+    """Command frame with checksum."""
+    param_h = (param >> 8) & 0xFF
+    param_l = param & 0xFF
+    checksum = 0 - (VERSION + LENGTH + cmd + feedback + param_h + param_l)
+    checksum &= 0xFFFF
+    return bytes([
+        START, VERSION, LENGTH, cmd, feedback,
+        param_h, param_l, (checksum >> 8) & 0xFF, checksum & 0xFF, END
+    ])
+
+
+def parse_frames(buf):
+    """
+    Pop every complete frame from the bytearray 'buf' (consumed in place).
+    Returns a list of (cmd, param); noise and bad checksums are skipped.
+    """
+    frames = []
+    while True:
+        start = buf.find(START)
+        if start < 0:
+            buf.clear()
+            return frames
+        del buf[:start]
+        if len(buf) < 8:
+            return frames
+        if buf[1] != VERSION or buf[2] != LENGTH:
+            del buf[:1]
+            continue
+        if len(buf) >= 10 and buf[9] == END:
+            checksum = (0 - sum(buf[1:7])) & 0xFFFF
+            if checksum == (buf[7] << 8) | buf[8]:
+                frames.append((buf[3], (buf[5] << 8) | buf[6]))
+                del buf[:10]
+                continue
+        if buf[7] == END:          # clone without checksum
+            frames.append((buf[3], (buf[5] << 8) | buf[6]))
+            del buf[:8]
+            continue
+        if len(buf) < 10:
+            return frames          # rest of the frame not here yet
+        del buf[:1]
+
+
+def wait_ready(ser, timeout=READY_TIMEOUT, query_every=QUERY_EVERY):
+    """
+    Wait until the module says it is up. Returns (ready, devices, seconds):
+    'ready' is False on timeout, 'devices' the online-device bits (None
+    if not reported).
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    next_query = start
+    buf = bytearray()
+    old_timeout = ser.timeout
+    ser.timeout = 0.05
+    try:
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                return False, None, now - start
+            if now >= next_query:
+                ser.write(build_frame(CMD_QUERY_INIT, 0))
+                next_query = now + query_every
+            data = ser.read(max(1, ser.in_waiting))
+            if not data:
+                continue
+            buf += data
+            for cmd, param in parse_frames(buf):
+                if cmd == CMD_QUERY_INIT or cmd == CMD_INSERTED:
+                    return True, param & 0xFF, time.monotonic() - start
+    finally:
+        ser.timeout = old_timeout
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Hotplug-driven DS4 discovery.
+
+Instead of polling a fixed /dev/input/eventN path, watch /dev/input with
+inotify and identify the controller from sysfs (name, vendor/product and
+capability bitmaps) without opening every input node. The DS4 also
+registers "Touchpad" and "Motion Sensors" nodes; those are skipped.
+
+The role of each (vendor, product, name) is cached, so a reconnecting
+controller is recognized from a couple of small sysfs reads and handed
+over as soon as its event node becomes accessible.
+"""
+import asyncio
+import ctypes
+import ctypes.util
+import glob
+import os
+import select
+import struct
+import time
+
+from evdev import InputDevice
+
+INPUT_DIR = "/dev/input"
+SYSFS_INPUT = "/sys/class/input"
+
+# Substring every DS4 node name contains (BT and USB)
+DS4_NAME = "Wireless Controller"
+
+ROLE_GAMEPAD = "gamepad"
+ROLE_TOUCHPAD = "touchpad"
+ROLE_MOTION = "motion"
+
+# Capabilities the gamepad node must have
+REQUIRED_ABS = (0x01, 0x02, 0x04, 0x05)   # ABS_Y, ABS_Z, ABS_RY, ABS_RZ
+REQUIRED_KEYS = (0x133,)                  # BTN_NORTH
+
+# ======================================================
+#                       INOTIFY
+# ======================================================
+
+IN_ATTRIB = 0x00000004
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")   # wd, mask, cookie, len
+
+_libc = None
+
+
+def _inotify_fd(path):
+    """Return a non-blocking inotify fd watching 'path', or None if unavailable."""
+    global _libc
+
+    try:
+        if _libc is None:
+            _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6",
+                                use_errno=True)
+        fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = _libc.inotify_add_watch(fd, os.fsencode(path),
+                                     IN_CREATE | IN_ATTRIB | IN_MOVED_TO)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, f"inotify_add_watch({path}) failed")
+        return fd
+    except (OSError, AttributeError) as e:
+        print(f"[DS4] inotify unavailable ({e}); falling back to polling")
+        return None
+
+
+def _inotify_names(fd):
+    """Drain pending inotify events and return the file names they mention."""
+    names = []
+    while True:
+        try:
+            buf = os.read(fd, 4096)
+        except BlockingIOError:
+            return names
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buf):
+            _wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+            offset += _EVENT_HEADER.size
+            name = buf[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name:
+                names.append(os.fsdecode(name))
+
+
+# ======================================================
+#                   SYSFS IDENTIFICATION
+# ======================================================
+
+_BITS_PER_LONG = struct.calcsize("l") * 8
+
+
+def _read_sysfs(node, rel):
+    try:
+        with open(f"{SYSFS_INPUT}/{node}/device/{rel}") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _bitmap(text):
+    """Parse a sysfs capability bitmap (hex longs, most significant first)."""
+    value = 0
+    for word in (text or "").split():
+        value = (value << _BITS_PER_LONG) | int(word, 16)
+    return value
+
+
+def _has_bits(bitmap, codes):
+    for code in codes:
+        if not (bitmap >> code) & 1:
+            return False
+    return True
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class DS4Finder:
+    """Find the DS4 gamepad node and wait for it to (re)appear."""
+
+    def __init__(self, input_dir=INPUT_DIR):
+        self.input_dir = input_dir
+        self.roles = {}   # (vendor, product, name) -> role or None
+        self.fd = _inotify_fd(input_dir)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def role_of(self, node):
+        """Role of an eventN node, identified from sysfs and cached per model."""
+        name = _read_sysfs(node, "name")
+        if name is None:
+            return None
+        key = (_read_sysfs(node, "id/vendor"), _read_sysfs(node, "id/product"), name)
+
+        if key in self.roles:
+            return self.roles[key]
+
+        lowered = name.lower()
+        if DS4_NAME.lower() not in lowered:
+            role = None
+        elif "touchpad" in lowered:
+            role = ROLE_TOUCHPAD
+        elif "motion" in lowered:
+            role = ROLE_MOTION
+        elif (_has_bits(_bitmap(_read_sysfs(node, "capabilities/abs")), REQUIRED_ABS) and
+              _has_bits(_bitmap(_read_sysfs(node, "capabilities/key")), REQUIRED_KEYS)):
+            role = ROLE_GAMEPAD
+        else:
+            role = None
+
+        self.roles[key] = role
+        print(f"[DS4] {name} ({key[0]}:{key[1]}) → role {role}")
+        return role
+
+    def _open(self, node):
+        """Open a gamepad node; None if it is not accessible (yet)."""
+        path = os.path.join(self.input_dir, node)
+        try:
+            return InputDevice(path)
+        except OSError:
+            # Node created but udev has not set permissions yet (IN_ATTRIB follows)
+            return None
+
+    def find(self, role=ROLE_GAMEPAD):
+        """Scan existing nodes once; return an open InputDevice or None."""
+        for path in sorted(glob.glob(os.path.join(self.input_dir, "event*"))):
+            node = os.path.basename(path)
+            if self.role_of(node) == role:
+                dev = self._open(node)
+                if dev is not None:
+                    return dev
+        return None
+
+    def _check_names(self, names, role):
+        for node in names:
+            if node.startswith("event") and self.role_of(node) == role:
+                dev = self._open(node)
+                if dev is not None:
+                    return dev
+        return None
+
+    def _handover(self, dev, start_ns, seen_ns=None):
+        now = time.monotonic_ns()
+        msg = f"[DS4] Detected: {dev.name} at {dev.path} (waited {(now - start_ns) / 1e6:.1f} ms"
+        if seen_ns is not None:
+            msg += f", handed over {(now - seen_ns) / 1e6:.2f} ms after the node appeared"
+        print(msg + ")")
+        return dev
+
+    def wait(self, role=ROLE_GAMEPAD, poll_delay=1.0):
+        """Block until a node with 'role' is available and return it opened."""
+        start_ns = time.monotonic_ns()
+        dev = self.find(role)
+        if dev is not None:
+            return self._handover(dev, start_ns)
+
+        print("[DS4] Waiting for controller to appear...")
+        while True:
+            if self.fd is None:
+                time.sleep(poll_delay)
+                dev = self.find(role)
+            else:
+                select.select([self.fd], [], [])
+                seen_ns = time.monotonic_ns()
+                dev = self._check_names(_inotify_names(self.fd), role)
+                if dev is not None:
+                    return self._handover(dev, start_ns, seen_ns)
+                continue
+            if dev is not None:
+                return self._handover(dev, start_ns)
+
+    async def wait_async(self, role=ROLE_GAMEPAD, poll_delay=1.0):
+        """Same as wait(), but yields to the event loop while waiting."""
+        start_ns = time.monotonic_ns()
+        dev = self.find(role)
+        if dev is not None:
+            return self._handover(dev, start_ns)
+
+        print("[DS4] Waiting for controller to appear...")
+        loop = asyncio.get_running_loop()
+        while True:
+            if self.fd is None:
+                await asyncio.sleep(poll_delay)
+                dev = self.find(role)
+            else:
+                ready = loop.create_future()
+                loop.add_reader(self.fd, _wake, ready)
+                try:
+                    await ready
+                finally:
+                    loop.remove_reader(self.fd)
+                seen_ns = time.monotonic_ns()
+                dev = self._check_names(_inotify_names(self.fd), role)
+                if dev is not None:
+                    return self._handover(dev, start_ns, seen_ns)
+                continue
+            if dev is not None:
+                return self._handover(dev, start_ns)
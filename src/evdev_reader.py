@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Raw evdev reader: struct input_event records straight from the device fd.
+
+python-evdev's read_loop() builds an InputEvent object for every event
+(plus a select() call per read); at DS4 rates that is hundreds of objects
+per second for the garbage collector. RawEventReader instead reads whole
+batches of records with readinto() into one preallocated bytearray and
+decodes them with struct.iter_unpack over a memoryview, handing plain
+ints to the handler. The unpacked tuples are freed right away, so the
+garbage collector never sees them.
+
+The record layout is the native 'struct input_event':
+
+    struct timeval time;   (long sec, long usec)
+    __u16 type;
+    __u16 code;
+    __s32 value;
+
+i.e. 24 bytes on 64-bit kernels, 16 on 32-bit ones ('llHHi' native).
+
+Catch-up: when the process stalls (GC, I2C, serial) the kernel queue
+fills and the frames come out in order, so the motors would replay every
+old stick position. With an 'on_backlog' callback, a read holding more
+than 'catch_up_frames' complete frames (or a SYN_DROPPED: the kernel
+queue overflowed) counts as a backlog: the queue is drained and the
+callback resyncs from the device state instead (sync_state() reads it
+with EVIOCGABS / EVIOCGKEY), so control acts on the newest state only.
+Every drained record still goes to the 'stale' handler when one is
+given, so button taps inside the backlog are not lost (only the caller
+knows which events are stale positions). evdev does not answer
+FIONREAD, so the frames in one read are the measure of how much input
+is pending.
+"""
+import asyncio
+import fcntl
+import io
+import os
+import select
+import struct
+
+from controller_state import (
+    EV_SYN, EV_KEY, EV_ABS, SYN_REPORT, SYN_DROPPED, ABS_SLOTS, KEY_SLOTS,
+)
+from input_filter import ABSINFO, EVIOCGABS, KEY_CNT
+
+INPUT_EVENT = struct.Struct("llHHi")
+
+DEFAULT_BATCH = 64   # events per read(), same as python-evdev
+CATCH_UP_FRAMES = 6  # more complete frames than this in one read = backlog
+                     # (~25 ms of DS4 reports: more than a scheduling hiccup)
+
+
+def EVIOCGKEY(size):
+    return 0x80004518 + (size << 16)
+
+
+def sync_state(fd, estado):
+    """Load the device's current value of every tracked axis and button into 'estado'."""
+    for code in ABS_SLOTS:
+        raw = fcntl.ioctl(fd, EVIOCGABS(code), bytes(ABSINFO.size))
+        estado.update(EV_ABS, code, ABSINFO.unpack(raw)[0])
+    keys = fcntl.ioctl(fd, EVIOCGKEY(KEY_CNT // 8), bytes(KEY_CNT // 8))
+    for code in KEY_SLOTS:
+        estado.update(EV_KEY, code, (keys[code // 8] >> (code % 8)) & 1)
+
+
+class RawEventReader:
+    """Read evdev events in batches into one reusable buffer."""
+
+    def __init__(self, batch=DEFAULT_BATCH, catch_up_frames=CATCH_UP_FRAMES):
+        self.buf = bytearray(INPUT_EVENT.size * batch)
+        self.view = memoryview(self.buf)
+        self.catch_up_frames = catch_up_frames
+
+        self.reads = 0
+        self.events = 0
+        self.max_batch = 0
+        self.catch_ups = 0
+        self.overflows = 0        # SYN_DROPPED seen
+        self.skipped = 0          # events drained by catch-ups
+
+    def read_into(self, f):
+        """
+        One read() from the unbuffered file 'f'; returns the memoryview of
+        the records it got, or None when nothing is pending (non-blocking
+        fd). Raises OSError when the device goes away.
+        """
+        n = f.readinto(self.buf)
+        if n is None:
+            return None
+        if n == 0:
+            raise OSError("end of file on input device")
+        n -= n % INPUT_EVENT.size   # the kernel only returns whole events
+        count = n // INPUT_EVENT.size
+        self.reads += 1
+        self.events += count
+        if count > self.max_batch:
+            self.max_batch = count
+        return self.view[:n]
+
+    def dispatch(self, records, handler):
+        """Call handler(etype, code, value, sec, usec) for every record."""
+        for sec, usec, etype, code, value in INPUT_EVENT.iter_unpack(records):
+            handler(etype, code, value, sec, usec)
+
+    def backlog(self, records):
+        """True when 'records' holds a SYN_DROPPED or too many frames."""
+        if len(records) <= self.catch_up_frames * INPUT_EVENT.size:
+            return False      # cannot hold more than catch_up_frames frames
+        frames = 0
+        for _sec, _usec, etype, code, _value in INPUT_EVENT.iter_unpack(records):
+            if etype == EV_SYN:
+                if code == SYN_REPORT:
+                    frames += 1
+                elif code == SYN_DROPPED:
+                    self.overflows += 1
+                    return True
+        return frames > self.catch_up_frames
+
+    def catch_up(self, f, fd, records, on_backlog, stale=None):
+        """
+        Drain everything queued, handing each record to 'stale' (if given),
+        then let 'on_backlog' resync.
+        """
+        blocking = os.get_blocking(fd)
+        if blocking:
+            os.set_blocking(fd, False)
+        try:
+            skipped = 0
+            while records is not None:
+                skipped += len(records) // INPUT_EVENT.size
+                if stale is not None:
+                    self.dispatch(records, stale)
+                newest = records[-INPUT_EVENT.size:]
+                sec, usec = INPUT_EVENT.unpack(newest)[:2]
+                records = self.read_into(f)
+        finally:
+            if blocking:
+                os.set_blocking(fd, True)
+        self.catch_ups += 1
+        self.skipped += skipped
+        on_backlog(fd, sec, usec)
+
+    def read_loop(self, fd, handler, on_backlog=None, stale=None):
+        """
+        Blocking loop: feed every event of 'fd' to 'handler' until the
+        device fails (OSError, as with python-evdev's read_loop()). The fd
+        stays owned by the caller and may be O_NONBLOCK (InputDevice).
+        With 'on_backlog(fd, sec, usec)' a backlog is skipped (see above);
+        sec/usec stamp the newest event drained. 'stale' (same signature
+        as 'handler') gets the drained events.
+        """
+        with io.FileIO(fd, "rb", closefd=False) as f:
+            while True:
+                records = self.read_into(f)
+                if records is None:
+                    select.select([fd], [], [])
+                    continue
+                if on_backlog is not None and self.backlog(records):
+                    self.catch_up(f, fd, records, on_backlog, stale)
+                    continue
+                self.dispatch(records, handler)
+
+    async def async_read_loop(self, fd, handler, on_backlog=None, stale=None):
+        """Same as read_loop(), waiting for input on the running event loop."""
+        loop = asyncio.get_running_loop()
+        with io.FileIO(fd, "rb", closefd=False) as f:
+            while True:
+                records = self.read_into(f)
+                if records is None:
+                    ready = loop.create_future()
+                    loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+                    try:
+                        await ready
+                    finally:
+                        loop.remove_reader(fd)
+                    continue
+                if on_backlog is not None and self.backlog(records):
+                    self.catch_up(f, fd, records, on_backlog, stale)
+                    continue
+                self.dispatch(records, handler)
+
+    def report(self):
+        if self.reads == 0:
+            return
+        print(f"[INPUT] Raw reader: {self.events} events in {self.reads} reads "
+              f"(avg {self.events / self.reads:.1f}/read, max {self.max_batch})")
+        if self.catch_ups:
+            print(f"[INPUT] {self.catch_ups} catch-ups ({self.overflows} after a "
+                  f"kernel queue overflow), {self.skipped} backlog events drained")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Compare python-evdev's read_loop() with the raw batched reader.
+
+Both readers consume the same synthetic DS4 stream (stick / trigger
+events closed by SYN_REPORT) through a pipe, so the fd-level path is the
+one used on the car: python-evdev's own EventIO.read_loop() (select +
+device_read_many + one InputEvent per event) against
+RawEventReader.read_loop() (readinto a reusable buffer + iter_unpack).
+Every event is folded into a ControllerState, like main.py does.
+
+Reported per reader: events/s and the peak memory allocated while
+reading (traced with tracemalloc, the stream itself excluded). read_loop()
+holds a list of tuples for a whole batch plus an InputEvent per event;
+the raw reader reuses its buffer and only ever holds one unpacked tuple.
+
+    python3 src/examples/bench_evdev_reader.py [--events 200000] [--frames 1]
+"""
+import argparse
+import fcntl
+import io
+import os
+import select
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_state import ControllerState, EV_ABS, EV_SYN, SYN_REPORT
+from evdev_reader import INPUT_EVENT, RawEventReader
+
+try:
+    from evdev.eventio import EventIO
+except ImportError:
+    EventIO = None
+
+F_SETPIPE_SZ = 1031
+F_GETPIPE_SZ = 1032
+PIPE_SIZE = 1 << 20
+
+# One DS4 report: both sticks, both triggers, then SYN_REPORT
+FRAME_CODES = (0x00, 0x01, 0x03, 0x04, 0x02, 0x05)
+
+
+def make_stream(n_events):
+    buf = bytearray()
+    t = 0
+    while len(buf) < n_events * INPUT_EVENT.size:
+        t += 4000
+        for i, code in enumerate(FRAME_CODES):
+            buf += INPUT_EVENT.pack(t // 1_000_000, t % 1_000_000, EV_ABS, code,
+                                    (t // 4000 + 37 * i) % 256)
+        buf += INPUT_EVENT.pack(t // 1_000_000, t % 1_000_000, EV_SYN, SYN_REPORT, 0)
+    return bytes(buf[:n_events * INPUT_EVENT.size])
+
+
+def open_pipe():
+    r, w = os.pipe()
+    try:
+        fcntl.fcntl(w, F_SETPIPE_SZ, PIPE_SIZE)
+    except OSError:
+        pass
+    size = fcntl.fcntl(w, F_GETPIPE_SZ)
+    return r, w, size
+
+
+if EventIO is not None:
+    class PipeEvents(EventIO):
+        """python-evdev's EventIO on a plain fd (no device ioctls needed)."""
+
+        def __init__(self, fd):
+            self.fd = fd
+
+
+def run(stream, read_chunk, frames=0, trace=False):
+    """Push 'stream' through a pipe chunk by chunk; time only the reading."""
+    r, w, size = open_pipe()
+    if frames > 0:
+        chunk_bytes = frames * (len(FRAME_CODES) + 1) * INPUT_EVENT.size
+    else:
+        chunk_bytes = size // INPUT_EVENT.size * INPUT_EVENT.size
+    chunks = [stream[start:start + chunk_bytes]
+              for start in range(0, len(stream), chunk_bytes)]
+    estado = ControllerState()
+    total = len(stream) // INPUT_EVENT.size
+
+    if trace:
+        tracemalloc.start()
+    elapsed = 0
+    for chunk in chunks:
+        os.write(w, chunk)
+        t0 = time.perf_counter_ns()
+        read_chunk(r, estado, len(chunk) // INPUT_EVENT.size)
+        elapsed += time.perf_counter_ns() - t0
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    os.close(r)
+    os.close(w)
+    return total / (elapsed / 1e9), peak
+
+
+def evdev_chunk(fd, estado, count):
+    seen = 0
+    for event in PipeEvents(fd).read_loop():
+        if event.type == EV_ABS:
+            estado.update(event.type, event.code, event.value)
+        seen += 1
+        if seen == count:
+            return
+
+
+def make_raw_chunk():
+    """The body of RawEventReader.read_loop(), stopping after 'count' events."""
+    reader = RawEventReader()
+    files = {}
+
+    def raw_chunk(fd, estado, count):
+        f = files.get(fd)
+        if f is None:
+            f = files[fd] = io.FileIO(fd, "rb", closefd=False)
+        seen = [0]
+
+        def handler(etype, code, value, sec, usec):
+            if etype == EV_ABS:
+                estado.update(etype, code, value)
+            seen[0] += 1
+
+        while seen[0] < count:
+            records = reader.read_into(f)
+            if records is None:
+                select.select([fd], [], [])
+                continue
+            reader.dispatch(records, handler)
+
+    return reader, raw_chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--frames", type=int, default=0,
+                        help="frames pending per read (the DS4 delivers ~1); "
+                             "0 = keep the pipe full (64-event reads)")
+    args = parser.parse_args()
+
+    stream = make_stream(args.events)
+    print(f"{args.events} events ({INPUT_EVENT.size}-byte input_event), "
+          f"{len(FRAME_CODES) + 1} per frame\n")
+
+    readers = []
+    if EventIO is not None:
+        readers.append(("evdev read_loop", evdev_chunk))
+    else:
+        print("python-evdev not installed: raw reader only\n")
+    raw, raw_chunk = make_raw_chunk()
+    readers.append(("raw readinto", raw_chunk))
+
+    print(f"{'reader':<18} {'events/s':>12} {'peak allocated':>15}")
+    results = {}
+    for name, fn in readers:
+        rate, _ = run(stream, fn, args.frames)
+        _, peak = run(stream, fn, args.frames, trace=True)
+        results[name] = rate
+        print(f"{name:<18} {rate:>12,.0f} {peak / 1024:>11.1f} KiB")
+
+    if len(results) == 2:
+        base, fast = results["evdev read_loop"], results["raw readinto"]
+        print(f"\nraw reader: x{fast / base:.2f} events/s")
+    print()
+    raw.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+CPU time of the EN pins with software PWM (RPi.GPIO threads) versus the
+SoC's hardware PWM (/sys/class/pwm).
+
+Each mode sets the four EN pins to a duty, holds it for a few seconds
+with the motors otherwise idle and measures the process CPU time spent
+meanwhile (RPi.GPIO's PWM threads run inside this process, so they are
+included). Needs the pin-mux setup described in README / motor_backends.
+
+Without /sys/class/pwm/pwmchip0 the hardware mode runs against a
+directory that imitates it ("hw*"), which checks the code path only.
+
+The default duty is a value from the percent duty tables, a float like
+every duty main.py produces; the hardware mode checks that duty_cycle
+received an integer (the kernel rejects anything else).
+
+    sudo python3 src/examples/bench_hw_pwm.py [SECONDS] [DUTY]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from curves import DutyTables
+from motor_backends import PWMCHIP_PATH, RPiGPIOBackend, SysfsPWM
+
+DIR_PINS = [17, 27, 10, 9, 23, 24, 25, 8]
+PWM_PINS = [13, 19, 18, 12]
+
+
+def fake_pwmchip():
+    """Directory with the sysfs attributes SysfsPWM writes to."""
+    root = tempfile.mkdtemp(prefix="pwmchip")
+    for ch in (0, 1):
+        os.mkdir(os.path.join(root, f"pwm{ch}"))
+        for attr in ("enable", "period", "duty_cycle"):
+            open(os.path.join(root, f"pwm{ch}", attr), "w").close()
+    for attr in ("export", "unexport"):
+        open(os.path.join(root, attr), "w").close()
+    return root
+
+
+def check_duty_cycle(backend):
+    """Every channel's duty_cycle must hold a plain integer (ns)."""
+    ok = True
+    for ch in backend.fds:
+        with open(backend._attr(ch, "duty_cycle")) as f:
+            text = f.read().strip()
+        if not text.isdigit():
+            print(f"BAD pwm{ch}/duty_cycle = {text!r}, not an integer")
+            ok = False
+    return ok
+
+
+def measure(name, backend, seconds, duty):
+    try:
+        backend.setup()
+    except Exception as e:
+        print(f"{name:<6} skipped ({e})")
+        return None
+
+    try:
+        for pin in PWM_PINS:
+            backend.set_duty(pin, duty)
+        if isinstance(backend, SysfsPWM) and not check_duty_cycle(backend):
+            return None
+        c0 = time.process_time()
+        t0 = time.monotonic()
+        time.sleep(seconds)
+        cpu = time.process_time() - c0
+        wall = time.monotonic() - t0
+    finally:
+        backend.cleanup()
+
+    print(f"{name:<6} {duty:.1f}% for {wall:.1f} s: cpu {cpu * 1e3:8.1f} ms "
+          f"({100 * cpu / wall:5.2f}% of a core)")
+    return cpu / wall
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    # A float, as the duty tables (and the ramp) produce them
+    duty = float(sys.argv[2]) if len(sys.argv) > 2 else DutyTables().ly[40]
+
+    soft = measure("soft", RPiGPIOBackend(DIR_PINS, PWM_PINS), seconds, duty)
+
+    if os.path.isdir(PWMCHIP_PATH):
+        name, chip = "hw", PWMCHIP_PATH
+    else:
+        name, chip = "hw*", fake_pwmchip()
+    hw = measure(name, SysfsPWM(PWM_PINS, chip_path=chip), seconds, duty)
+
+    if soft is not None and hw is not None:
+        print(f"Hardware PWM saves {100 * (soft - hw):.2f}% of a core "
+              f"({(soft - hw) * 1e3:.1f} ms of CPU per second)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Compare the motor backends: wall time and CPU time per command.
+
+Runs the same sequence of direction writes and duty changes through each
+backend that can be set up on this machine (rpigpio / pigpio need the Pi,
+sim runs anywhere) and prints the cost per call. Direction updates are
+measured twice: eight single-pin writes, and one compiled bank write.
+Startup pin configuration (backend.setup()) is timed once per backend.
+
+gpiod uses /dev/gpiochip0 unless a chip is given; to run it without a Pi,
+create a gpio-sim / gpio-mockup chip with at least 28 lines, e.g.
+
+    sudo modprobe gpio-mockup gpio_mockup_ranges=-1,32
+    python3 src/examples/bench_motor_backends.py 2000 /dev/gpiochipN
+
+Without /dev/gpiomem the gpiomem backend is also run against a
+file-backed mmap ("gpiomem*"), with simulated PWM for the EN pins.
+
+    sudo python3 src/examples/bench_motor_backends.py [N] [GPIOCHIP]
+"""
+import mmap
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from curves import PERCENT
+from motor_backends import (
+    BACKENDS, GPIO_BLOCK_SIZE, GPIOCHIP_PATH, GpiomemBackend, SimBackend,
+    create_backend,
+)
+
+DIR_PINS = [17, 27, 10, 9, 23, 24, 25, 8]
+PWM_PINS = [13, 19, 18, 12]
+
+
+def file_backed_gpiomem():
+    """gpiomem backend over an ordinary temporary file instead of the SoC."""
+    f = tempfile.TemporaryFile()
+    f.truncate(GPIO_BLOCK_SIZE)
+    regs = mmap.mmap(f.fileno(), GPIO_BLOCK_SIZE)
+    return GpiomemBackend(DIR_PINS, PWM_PINS, regs=regs,
+                          duty_backend=SimBackend([], PWM_PINS))
+
+
+def bench(name, n, backend=None, **kwargs):
+    if backend is None:
+        backend = create_backend(name, DIR_PINS, PWM_PINS, **kwargs)
+    try:
+        t0 = time.perf_counter_ns()
+        c0 = time.process_time_ns()
+        backend.setup()
+        wall = time.perf_counter_ns() - t0
+        cpu = time.process_time_ns() - c0
+        print(f"{name:<8} {'setup':<11} {'':>7}          "
+              f"wall {wall / 1e3:8.2f} us          cpu {cpu / 1e3:8.2f} us")
+    except Exception as e:
+        print(f"{name:<10} skipped ({e})")
+        return
+
+    # Duties that alternate so every call really changes something
+    if backend.duty_scale == PERCENT:
+        duties = (30, 60)
+    else:
+        duties = (300_000, 600_000)
+
+    # Forward ↔ backward on both sides: every IN pin flips on each update
+    fwd = sum(1 << pin for pin in DIR_PINS[0::2])
+    bwd = sum(1 << pin for pin in DIR_PINS[1::2])
+    banks = (backend.compile_bank(fwd, bwd), backend.compile_bank(bwd, fwd))
+
+    try:
+        t0 = time.perf_counter_ns()
+        c0 = time.process_time_ns()
+        for i in range(n):
+            level = i & 1
+            for pin in DIR_PINS:
+                backend.write(pin, level)
+        _print(name, "pin writes", n, time.perf_counter_ns() - t0,
+               time.process_time_ns() - c0)
+
+        t0 = time.perf_counter_ns()
+        c0 = time.process_time_ns()
+        for i in range(n):
+            backend.write_bank(banks[i & 1])
+        _print(name, "bank write", n, time.perf_counter_ns() - t0,
+               time.process_time_ns() - c0)
+
+        t0 = time.perf_counter_ns()
+        c0 = time.process_time_ns()
+        for i in range(n):
+            duty = duties[i & 1]
+            for pin in PWM_PINS:
+                backend.set_duty(pin, duty)
+        _print(name, "4x duty", n, time.perf_counter_ns() - t0,
+               time.process_time_ns() - c0)
+    finally:
+        backend.cleanup()
+
+
+def _print(name, what, updates, wall, cpu):
+    print(f"{name:<8} {what:<11} {updates:>7} updates  "
+          f"wall {wall / updates / 1e3:8.2f} us/update  "
+          f"cpu {cpu / updates / 1e3:8.2f} us/update  "
+          f"({updates * 1e9 / wall:,.0f} updates/s)")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    chip = sys.argv[2] if len(sys.argv) > 2 else GPIOCHIP_PATH
+    for name in sorted(BACKENDS):
+        if name == "gpiod":
+            bench(name, n, chip_path=chip)
+        else:
+            bench(name, n)
+    if not os.path.exists("/dev/gpiomem"):
+        bench("gpiomem*", n, file_backed_gpiomem())
+
+
+if __name__ == "__main__":
+    main()
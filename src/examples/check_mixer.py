@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Offline checks and timing for the mecanum mixer (src/mixer.py).
+
+1. Known motions: stick/trigger combinations whose wheel signs are fixed
+   by the kinematics (drive, strafe, rotate, diagonal, saturation).
+2. Batch vs per-sample: mix_batch() over a recording (or a synthetic
+   sweep of every stick/trigger combination) must match mix_controls().
+3. Cost per sample for both paths.
+
+    python3 src/examples/check_mixer.py [session.ds4rec]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_state import ControllerState, L2, LY, R2, RY, SYN_REPORT, EV_SYN
+from curves import PERCENT
+from input_record import RECORD, load_recording
+from mixer import MecanumMixer, np
+from wheels import WHEELS
+
+UP, CENTER, DOWN = 0, 128, 255
+
+# (name, ly, ry, l2, r2, expected wheel signs FL, FR, RL, RR)
+CASES = [
+    ("stopped",        CENTER, CENTER, 0,   0,   (0, 0, 0, 0)),
+    ("forward",        UP,     UP,     0,   0,   (1, 1, 1, 1)),
+    ("backward",       DOWN,   DOWN,   0,   0,   (-1, -1, -1, -1)),
+    ("strafe left",    CENTER, CENTER, 255, 0,   (-1, 1, 1, -1)),
+    ("strafe right",   CENTER, CENTER, 0,   255, (1, -1, -1, 1)),
+    ("rotate left",    DOWN,   UP,     0,   0,   (-1, 1, -1, 1)),
+    ("rotate right",   UP,     DOWN,   0,   0,   (1, -1, 1, -1)),
+    ("diagonal FL",    UP,     UP,     255, 0,   (0, 1, 1, 0)),
+    ("triggers both",  CENTER, CENTER, 255, 255, (0, 0, 0, 0)),
+]
+
+
+def sign(x):
+    return (x > 0) - (x < 0)
+
+
+def check_cases(mixer):
+    ok = True
+    for name, ly, ry, l2, r2, expected in CASES:
+        duties = tuple(mixer.mix_controls(ly, ry, l2, r2))
+        good = tuple(sign(d) for d in duties) == expected
+        good = good and max(abs(d) for d in duties) <= 100
+        ok = ok and good
+        print(f"{'ok ' if good else 'BAD'} {name:<14} "
+              + "  ".join(f"{w}={d:6.1f}" for w, d in zip(WHEELS, duties)))
+    return ok
+
+
+def frames_from_recording(path):
+    """Axis values (ly, ry, l2, r2) at every SYN_REPORT of a recording."""
+    estado = ControllerState()
+    ly, ry, l2, r2 = [], [], [], []
+    for _ts, etype, code, value in RECORD.iter_unpack(load_recording(path)):
+        if etype == EV_SYN and code == SYN_REPORT:
+            v = estado.values
+            ly.append(v[LY])
+            ry.append(v[RY])
+            l2.append(v[L2])
+            r2.append(v[R2])
+        else:
+            estado.update(etype, code, value)
+    return ly, ry, l2, r2
+
+
+def sweep():
+    """Every stick pair over a coarse grid, with every trigger combination."""
+    ly, ry, l2, r2 = [], [], [], []
+    for a in range(0, 256, 5):
+        for b in range(0, 256, 5):
+            for t in (0, 64, 255):
+                for u in (0, 128):
+                    ly.append(a)
+                    ry.append(b)
+                    l2.append(t)
+                    r2.append(u)
+    return ly, ry, l2, r2
+
+
+def main():
+    mixer = MecanumMixer(PERCENT)
+    ok = check_cases(mixer)
+
+    if len(sys.argv) > 1:
+        axes = frames_from_recording(sys.argv[1])
+        source = sys.argv[1]
+    else:
+        axes = sweep()
+        source = "synthetic sweep"
+    n = len(axes[0])
+    print(f"\n{n} samples from {source} (batch path: "
+          f"{'NumPy' if np is not None else 'pure Python'})")
+
+    t0 = time.perf_counter_ns()
+    single = [tuple(mixer.mix_controls(*sample)) for sample in zip(*axes)]
+    t_single = time.perf_counter_ns() - t0
+
+    t0 = time.perf_counter_ns()
+    batch = mixer.mix_batch(*axes)
+    t_batch = time.perf_counter_ns() - t0
+
+    same = all(tuple(float(d) for d in row) == tuple(float(d) for d in ref)
+               for row, ref in zip(batch, single))
+    ok = ok and same and len(batch) == n
+    print(f"{'ok ' if same else 'BAD'} batch matches per-sample mixing")
+    print(f"mix_controls {t_single / n:8.0f} ns/sample")
+    print(f"mix_batch    {t_batch / n:8.0f} ns/sample")
+    mixer.report()
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Check the pin sequences of the stop strategies on the simulated backend.
+
+For each strategy the four wheels are driven forward, then stopped, and
+the IN levels / EN duties recorded by SimBackend are compared with what
+the L298N needs:
+- coast:            both IN low, EN 0
+- brake:            both IN high, EN at full duty, held
+- brake_then_coast: the brake above, then coast once BRAKE_MS expired
+
+With EN pins sharing a hardware PWM channel (pigpio, --pwm hw) a wheel
+released next to a driven partner must coast: a brake would put full
+duty on the channel and drive the partner at full speed.
+
+    python3 src/examples/check_stop_modes.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from motor_backends import MotorOutputs, PWMChannelPairs, SimBackend
+from wheels import STOP_STRATEGIES, WHEELS, WheelDrive
+
+# Same wiring as src/main.py: wheel -> (IN forward, IN backward, EN)
+WHEEL_PINS = {
+    "FL": (17, 27, 13),
+    "FR": (25, 8, 12),
+    "RL": (10, 9, 19),
+    "RR": (24, 23, 18),
+}
+DIR_PINS = [17, 27, 10, 9, 23, 24, 25, 8]
+PWM_PINS = [13, 19, 18, 12]
+
+BRAKE_MS = 50
+FULL = 100
+
+
+def wheel_state(sim, wheel):
+    fwd, bwd, en = WHEEL_PINS[wheel]
+    return sim.levels[fwd], sim.levels[bwd], sim.duties[en]
+
+
+def expect(label, sim, expected):
+    ok = True
+    for wheel in WHEELS:
+        got = wheel_state(sim, wheel)
+        if got != expected:
+            print(f"BAD {label}: {wheel} (IN fwd, IN bwd, EN) = {got}, expected {expected}")
+            ok = False
+    if ok:
+        print(f"ok  {label}: every wheel (IN fwd, IN bwd, EN) = {expected}")
+    return ok
+
+
+def check(strategy):
+    sim = SimBackend(DIR_PINS, PWM_PINS)
+    out = MotorOutputs(sim)
+    out.setup()
+    wheels = WheelDrive(out, WHEEL_PINS, stop=strategy, brake_duty=FULL,
+                        brake_ms=BRAKE_MS)
+
+    print(f"--- {strategy}")
+    wheels.drive(60, 60, 60, 60)
+    ok = expect("driving", sim, (1, 0, 60))
+
+    wheels.stop()
+    if strategy == "coast":
+        ok &= expect("stopped", sim, (0, 0, 0))
+    else:
+        ok &= expect("braking", sim, (1, 1, FULL))
+        # The direction bits must change in one bank write, never pin by pin
+        banks = [entry for entry in sim.log if entry[1] == "bank"]
+        singles = [entry for entry in sim.log if entry[1] == "write"]
+        clean = not singles and len(banks) == 2
+        ok &= clean
+        print(f"{'ok ' if clean else 'BAD'} {len(banks)} bank writes, "
+              f"{len(singles)} single-pin writes")
+
+    # Control keeps ticking with the wheels released
+    time.sleep(BRAKE_MS / 2 / 1000)
+    wheels.stop()
+    if strategy != "coast":
+        ok &= expect(f"{BRAKE_MS / 2:.0f} ms later", sim, (1, 1, FULL))
+    time.sleep(BRAKE_MS / 1000)
+    wheels.stop()
+    if strategy == "brake":
+        ok &= expect(f"{1.5 * BRAKE_MS:.0f} ms later", sim, (1, 1, FULL))
+    else:
+        ok &= expect(f"{1.5 * BRAKE_MS:.0f} ms later", sim, (0, 0, 0))
+
+    # Shutdown path: immediate stop, then settle() ends a timed brake
+    wheels.drive(-40, -40, -40, -40)
+    ok &= expect("reversing", sim, (0, 1, 40))
+    wheels.stop(immediate=True)
+    wheels.settle()
+    ok &= expect("after settle()", sim, (1, 1, FULL) if strategy == "brake" else (0, 0, 0))
+    wheels.report()
+    return ok
+
+
+class PairedSim(SimBackend):
+    """SimBackend whose EN pins share PWM channels like pigpio / --pwm hw."""
+
+    def __init__(self, dir_pins, pwm_pins):
+        super().__init__(dir_pins, pwm_pins)
+        self.pairs = PWMChannelPairs(pwm_pins)
+        self.channel_out = {}
+
+    def set_duty(self, pin, duty):
+        super().set_duty(pin, duty)
+        ch, out = self.pairs.update(pin, duty)
+        self.channel_out[ch] = out
+
+
+def check_shared_channel(strategy):
+    sim = PairedSim(DIR_PINS, PWM_PINS)
+    out = MotorOutputs(sim)
+    out.setup()
+    wheels = WheelDrive(out, WHEEL_PINS, stop=strategy, brake_duty=FULL,
+                        brake_ms=BRAKE_MS)
+
+    # Mecanum: FL released while RL (same channel, EN 13 / 19) keeps 30%
+    wheels.drive(60, 0, 30, 0)
+    wheels.drive(0, 0, 30, 0)
+    ch = sim.pairs.channel[WHEEL_PINS["RL"][2]]
+    ok = expect_wheel("FL next to a driven RL", sim, "FL", (0, 0, 0))
+    good = sim.channel_out[ch] == 30
+    print(f"{'ok ' if good else 'BAD'} RL channel {ch} duty {sim.channel_out[ch]}, "
+          f"expected 30")
+    ok &= good
+
+    # Once RL stops too, both may brake (the channel carries no drive)
+    wheels.drive(0, 0, 0, 0)
+    if strategy != "coast":
+        ok &= expect_wheel("RL released, FL coasting", sim, "RL", (1, 1, FULL))
+    return ok
+
+
+def expect_wheel(label, sim, wheel, expected):
+    got = wheel_state(sim, wheel)
+    good = got == expected
+    print(f"{'ok ' if good else 'BAD'} {label}: {wheel} (IN fwd, IN bwd, EN) = {got}"
+          + ("" if good else f", expected {expected}"))
+    return good
+
+
+def main():
+    ok = True
+    for strategy in STOP_STRATEGIES:
+        ok &= check(strategy)
+    for strategy in STOP_STRATEGIES:
+        print(f"--- {strategy}, shared PWM channels")
+        ok &= check_shared_channel(strategy)
+    print("\nall stop strategies OK" if ok else "\nSTOP STRATEGY CHECK FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
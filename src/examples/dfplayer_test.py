@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
+import os
+import sys
 import time
 import serial
 from serial import SerialException
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dfplayer import wait_ready, DEVICE_SD
+
 SERIAL_PORT = "/dev/serial0"
 BAUD_RATE = 9600
 MAX_VOL = 15
@@ -46,10 +51,19 @@ def df_play_track(ser, num):
 
 def main():
     print("[DFPLAYER] Opening serial...")
+    start = time.monotonic()
     ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
 
-    print("[DFPLAYER] Waiting 3s for module to boot and mount SD...")
-    time.sleep(3.0)
+    # The module reports 0x3F once the SD card is mounted (3 s at most)
+    print("[DFPLAYER] Waiting for the module to boot and mount SD...")
+    answered, devices, seconds = wait_ready(ser)
+    if not answered:
+        print(f"[DFPLAYER] No answer after {seconds:.1f} s, assuming it is up")
+    elif not devices & DEVICE_SD:
+        print(f"[DFPLAYER] Ready after {seconds * 1000:.0f} ms, but no SD card "
+              f"(devices 0x{devices:02x})")
+    else:
+        print(f"[DFPLAYER] Ready after {seconds * 1000:.0f} ms (SD card online)")
 
     print("[DFPLAYER] Setting volume...")
     df_set_volume(ser, 25)
@@ -63,6 +77,8 @@ def main():
     for track in range(start_track, end_track + 1):
         print(f"[SCAN] Playing track {track} ...")
         df_play_track(ser, track)
+        if track == start_track:
+            print(f"[DFPLAYER] Time to first sound: {time.monotonic() - start:.2f} s")
         # escucha unos segundos cada canción
         time.sleep(5)
 
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Measure how often the DS4 wakes the program, without and with the kernel
+input filter (src/input_filter.py).
+
+The gamepad node is read for SECONDS unfiltered, then for SECONDS with
+stick fuzz/flat and the event mask that main.py programs. Every return
+from select() is a wakeup. Leave the controller on the table (resting
+jitter) or move it the same way in both phases. The original absinfo is
+restored at the end.
+
+    sudo python3 src/examples/measure_input_wakeups.py [--seconds 10] [--path /dev/input/eventN]
+"""
+import argparse
+import io
+import os
+import select
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from controller_state import ABS_RY, ABS_SLOTS, ABS_Y, EV_SYN, KEY_SLOTS, SYN_REPORT
+from curves import STICK_HIGH, STICK_LOW
+from evdev_reader import INPUT_EVENT, RawEventReader
+from input_filter import InputFilter
+
+STICK_FUZZ = 4   # same defaults as src/main.py
+STICK_FLAT = (STICK_HIGH - STICK_LOW) // 2
+
+
+def measure(fd, seconds):
+    """Return (wakeups, events, frames) read from 'fd' during 'seconds'."""
+    reader = RawEventReader()
+    wakeups = frames = 0
+    end = time.monotonic() + seconds
+    with io.FileIO(fd, "rb", closefd=False) as f:
+        while True:
+            left = end - time.monotonic()
+            if left <= 0:
+                break
+            ready, _, _ = select.select([fd], [], [], left)
+            if not ready:
+                continue
+            wakeups += 1
+            while True:
+                records = reader.read_into(f)
+                if records is None:
+                    break
+                for _sec, _usec, etype, code, _value in INPUT_EVENT.iter_unpack(records):
+                    if etype == EV_SYN and code == SYN_REPORT:
+                        frames += 1
+    return wakeups, reader.events, frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--path", help="gamepad event node (default: find the DS4)")
+    parser.add_argument("--fuzz", type=int, default=STICK_FUZZ)
+    parser.add_argument("--flat", type=int, default=STICK_FLAT)
+    args = parser.parse_args()
+
+    if args.path:
+        from evdev import InputDevice
+        dev = InputDevice(args.path)
+    else:
+        from ds4_discovery import DS4Finder
+        dev = DS4Finder().wait()
+    dev.grab()
+
+    absinfo = {ABS_Y: (args.fuzz, args.flat), ABS_RY: (args.fuzz, args.flat)}
+    filt = InputFilter(dev.fd, absinfo, ABS_SLOTS, KEY_SLOTS)
+    results = []
+    try:
+        print(f"Unfiltered, {args.seconds:g} s...")
+        results.append(("unfiltered", measure(dev.fd, args.seconds)))
+        filt.apply()
+        print(f"Filtered, {args.seconds:g} s...")
+        results.append(("filtered", measure(dev.fd, args.seconds)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        filt.restore()
+        dev.ungrab()
+        dev.close()
+
+    print(f"\n{'':<12} {'wakeups/s':>10} {'events/s':>10} {'frames/s':>10}")
+    for name, (wakeups, events, frames) in results:
+        s = args.seconds
+        print(f"{name:<12} {wakeups / s:>10.1f} {events / s:>10.1f} {frames / s:>10.1f}")
+    if len(results) == 2 and results[0][1][0]:
+        before, after = results[0][1][0], results[1][1][0]
+        print(f"\nwakeups: {100.0 * (before - after) / before:.1f}% fewer with the filter")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,19 @@ from evdev import InputDevice, ecodes
 import time
 import pigpio
 import os
+import sys
+
+# Shared duty curves live next to main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from curves import stick_table, trigger_table, PIGPIO
 
 DS4_PATH = "/dev/input/event4"
 PWM_FREQ = 20000  # 20 kHz
 
+# Raw 0–255 → pigpio duty (0–1_000_000), built once at startup
+STICK_DUTY = stick_table(PIGPIO)      # > 0 forward, < 0 backward
+TRIGGER_DUTY = trigger_table(PIGPIO)
+
 # ------------ INITIALIZE pigpio ------------
 pi = pigpio.pi()
 if not pi.connected:
@@ -145,7 +154,7 @@ def left_axis_backward(y):
     pi.write(L_IN3, 0)
     pi.write(L_IN4, 1)
 
-    pwm_ly = int(300_000 + (y - 140) * 700_000 / 115)
+    pwm_ly = -STICK_DUTY[y]
     pi.hardware_PWM(L_ENA, PWM_FREQ, pwm_ly)
     pi.hardware_PWM(L_ENB, PWM_FREQ, pwm_ly)
 
@@ -155,7 +164,7 @@ def left_axis_forward(y):
     pi.write(L_IN3, 1)
     pi.write(L_IN4, 0)
 
-    pwm_ly = int(1_000_000 - (y * 700_000 / 120))
+    pwm_ly = STICK_DUTY[y]
     pi.hardware_PWM(L_ENA, PWM_FREQ, pwm_ly)
     pi.hardware_PWM(L_ENB, PWM_FREQ, pwm_ly)
 
@@ -165,7 +174,7 @@ def right_axis_backward(x):
     pi.write(R_IN3, 0)
     pi.write(R_IN4, 1)
 
-    pwm_ry = int(300_000 + (x - 140) * 700_000 / 115)
+    pwm_ry = -STICK_DUTY[x]
     pi.hardware_PWM(R_ENA, PWM_FREQ, pwm_ry)
     pi.hardware_PWM(R_ENB, PWM_FREQ, pwm_ry)
 
@@ -175,7 +184,7 @@ def right_axis_forward(x):
     pi.write(R_IN3, 1)
     pi.write(R_IN4, 0)
 
-    pwm_ry = int(1_000_000 - (x * 700_000 / 120))
+    pwm_ry = STICK_DUTY[x]
     pi.hardware_PWM(R_ENA, PWM_FREQ, pwm_ry)
     pi.hardware_PWM(R_ENB, PWM_FREQ, pwm_ry)
 
@@ -190,7 +199,7 @@ def left_lateral_movement(lz):
     pi.write(L_IN3, 1)
     pi.write(L_IN4, 0)
 
-    pwm_z = int(300_000 + (lz * 700_000 / 255))
+    pwm_z = TRIGGER_DUTY[lz]
     pi.hardware_PWM(R_ENA, PWM_FREQ, pwm_z)
     pi.hardware_PWM(R_ENB, PWM_FREQ, pwm_z)
     pi.hardware_PWM(L_ENA, PWM_FREQ, pwm_z)
@@ -207,7 +216,7 @@ def right_lateral_movement(rz):
     pi.write(L_IN3, 0)
     pi.write(L_IN4, 1)
 
-    pwm_z = int(300_000 + (rz * 700_000 / 255))
+    pwm_z = TRIGGER_DUTY[rz]
     pi.hardware_PWM(R_ENA, PWM_FREQ, pwm_z)
     pi.hardware_PWM(R_ENB, PWM_FREQ, pwm_z)
     pi.hardware_PWM(L_ENA, PWM_FREQ, pwm_z)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Kernel-side filtering of the DS4 event stream.
+
+The sticks jitter by a few counts at rest, and every jitter wakes the
+process just for control to throw it away in the deadzone. Two evdev
+features drop that noise before it reaches userspace:
+
+- absinfo fuzz (EVIOCSABS): the input core ignores changes smaller than
+  fuzz / 2 and smooths changes up to 2 * fuzz, so a stick resting around
+  the center stops producing events. 'flat' is stored too, so other
+  readers of the node (joydev, SDL) see the same deadzone; the kernel
+  itself does not filter on it. absinfo belongs to the device, not to our
+  fd: the original values are saved and put back by restore().
+
+- event masks (EVIOCSMASK, Linux >= 4.4): per-fd filters for the event
+  types and codes we never consume (unused axes and buttons, EV_MSC scan
+  codes). The kernel also drops the SYN_REPORT of a frame left empty by
+  the mask, so those frames cause no wakeup at all. Masks die with the
+  fd; nothing to restore.
+
+Both are best effort: on failure the stream is simply unfiltered.
+"""
+import ctypes
+import errno
+import fcntl
+import struct
+
+from controller_state import EV_SYN, EV_KEY, EV_ABS
+
+ABSINFO = struct.Struct("6i")      # value, minimum, maximum, fuzz, flat, resolution
+INPUT_MASK = struct.Struct("IIQ")  # type, codes_size, codes_ptr
+
+EV_CNT = 0x20
+KEY_CNT = 0x300
+ABS_CNT = 0x40
+
+# Bitmap sizes of EVIOCSMASK per type (the EV_SYN mask selects event types)
+MASK_CNT = {EV_SYN: EV_CNT, EV_KEY: KEY_CNT, EV_ABS: ABS_CNT}
+
+
+def EVIOCGABS(code):
+    return 0x80184540 + code
+
+
+def EVIOCSABS(code):
+    return 0x401845C0 + code
+
+
+EVIOCSMASK = 0x40104593
+
+
+def _bitmap(codes, count):
+    """Little-endian bitmap of 'count' bits, the layout of a kernel unsigned long[]."""
+    words = (count + 63) // 64
+    bits = bytearray(8 * words)
+    for code in codes:
+        bits[code // 8] |= 1 << (code % 8)
+    return bits
+
+
+class InputFilter:
+    """
+    Program fuzz/flat on the axes in 'absinfo' ({code: (fuzz, flat)}) and
+    mask the fd down to the 'keys' and 'axes' codes (plus EV_SYN).
+    """
+
+    def __init__(self, fd, absinfo, axes, keys):
+        self.fd = fd
+        self.absinfo = absinfo
+        self.axes = tuple(axes)
+        self.keys = tuple(keys)
+        self.saved = {}          # code -> original absinfo (as read)
+        self.masked = False
+
+    def apply(self):
+        fd = self.fd
+        for code, (fuzz, flat) in self.absinfo.items():
+            try:
+                raw = fcntl.ioctl(fd, EVIOCGABS(code), bytes(ABSINFO.size))
+                value, lo, hi, _fuzz, _flat, res = ABSINFO.unpack(raw)
+                fcntl.ioctl(fd, EVIOCSABS(code),
+                            ABSINFO.pack(value, lo, hi, fuzz, flat, res))
+                self.saved[code] = raw
+            except OSError as e:
+                print(f"[INPUT] Axis 0x{code:02x}: fuzz/flat not set ({e})")
+
+        try:
+            self._mask(EV_SYN, (EV_SYN, EV_KEY, EV_ABS))
+            self._mask(EV_ABS, self.axes)
+            self._mask(EV_KEY, self.keys)
+            self.masked = True
+        except OSError as e:
+            if e.errno in (errno.EINVAL, errno.ENOTTY):
+                print("[INPUT] Event masks not supported by this kernel")
+            else:
+                print(f"[INPUT] Event masks not set ({e})")
+
+        parts = []
+        if self.saved:
+            parts.append("fuzz/flat on " + ", ".join(
+                f"0x{code:02x}={self.absinfo[code][0]}/{self.absinfo[code][1]}"
+                for code in self.saved))
+        if self.masked:
+            parts.append(f"masked to {len(self.axes)} axes + {len(self.keys)} buttons")
+        if parts:
+            print("[INPUT] Kernel filter: " + "; ".join(parts))
+
+    def _mask(self, etype, codes):
+        bits = _bitmap(codes, MASK_CNT[etype])
+        buf = ctypes.create_string_buffer(bytes(bits), len(bits))
+        fcntl.ioctl(self.fd, EVIOCSMASK,
+                    INPUT_MASK.pack(etype, len(bits), ctypes.addressof(buf)))
+
+    def restore(self):
+        """Put back the device's original fuzz/flat (a gone device is ignored)."""
+        for code, raw in self.saved.items():
+            _value, _lo, _hi, fuzz, flat, _res = ABSINFO.unpack(raw)
+            try:
+                current = fcntl.ioctl(self.fd, EVIOCGABS(code), bytes(ABSINFO.size))
+                value, lo, hi, _fuzz, _flat, res = ABSINFO.unpack(current)
+                fcntl.ioctl(self.fd, EVIOCSABS(code),
+                            ABSINFO.pack(value, lo, hi, fuzz, flat, res))
+            except OSError:
+                pass
+        self.saved = {}
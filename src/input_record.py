@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Binary recorder / replayer for raw DS4 evdev streams.
+
+File layout: an 8-byte magic header followed by fixed-size little-endian
+records of 16 bytes each:
+
+    int64  timestamp (ns, from the event's sec/usec)
+    uint16 type
+    uint16 code
+    int32  value
+
+Records are packed into a preallocated buffer and written in batches, so
+recording costs one pack_into per event and one write() per batch.
+"""
+import struct
+import time
+
+MAGIC = b"DS4REC\x01\x00"
+RECORD = struct.Struct("<qHHi")
+
+DEFAULT_BATCH = 256   # records per write()
+
+
+class InputRecorder:
+    """Append raw evdev events to a recording file."""
+
+    def __init__(self, path, batch=DEFAULT_BATCH):
+        self.path = path
+        self.batch = batch
+        self.buf = bytearray(RECORD.size * batch)
+        self.view = memoryview(self.buf)
+        self.n = 0
+        self.total = 0
+        self.f = open(path, "wb")
+        self.f.write(MAGIC)
+        print(f"[RECORD] Recording input to {path}")
+
+    def record(self, sec, usec, etype, code, value):
+        RECORD.pack_into(self.buf, self.n * RECORD.size,
+                         sec * 1_000_000_000 + usec * 1000, etype, code, value)
+        self.n += 1
+        if self.n == self.batch:
+            self.flush()
+
+    def flush(self):
+        if self.n:
+            self.f.write(self.view[:self.n * RECORD.size])
+            self.total += self.n
+            self.n = 0
+
+    def close(self):
+        if self.f is None:
+            return
+        self.flush()
+        self.f.close()
+        self.f = None
+        print(f"[RECORD] {self.total} events saved to {self.path}")
+
+
+def load_recording(path):
+    """Return a memoryview over the records of a recording file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a DS4 recording")
+    body = memoryview(data)[len(MAGIC):]
+    # Ignore a partially written last record
+    return body[:len(body) - len(body) % RECORD.size]
+
+
+def replay(path, handler, speed=1.0):
+    """
+    Feed a recording to 'handler(etype, code, value, sec, usec)'.
+
+    speed = 1.0 replays in real time, 2.0 twice as fast, 0 as fast as
+    possible. Events are stamped with the CLOCK_MONOTONIC time at which
+    they are injected, so latency measurements cover the Python pipeline.
+    Returns the number of events replayed.
+    """
+    records = load_recording(path)
+    print(f"[REPLAY] {len(records) // RECORD.size} events from {path} "
+          f"({'max speed' if speed <= 0 else f'x{speed:g}'})")
+
+    start_ns = time.monotonic_ns()
+    first_ts = None
+    count = 0
+
+    for ts, etype, code, value in RECORD.iter_unpack(records):
+        if first_ts is None:
+            first_ts = ts
+        if speed > 0:
+            due = start_ns + int((ts - first_ts) / speed)
+            delay = due - time.monotonic_ns()
+            if delay > 0:
+                time.sleep(delay / 1e9)
+
+        now = time.monotonic_ns()
+        handler(etype, code, value, now // 1_000_000_000, (now % 1_000_000_000) // 1000)
+        count += 1
+
+    elapsed = (time.monotonic_ns() - start_ns) / 1e9
+    print(f"[REPLAY] Done: {count} events in {elapsed:.3f} s")
+    return count
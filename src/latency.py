@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Input-to-actuation latency instrumentation.
+
+Each DS4 frame is timestamped at four points:
+- kernel:   event.sec / event.usec of its SYN_REPORT
+- recv:     when Python received that SYN_REPORT
+- decision: when the control logic consumed the frame
+- pwm:      the first ChangeDutyCycle actually issued after that decision
+
+Stage durations go into log-linear histograms (16 sub-buckets per power
+of two, ~6% resolution) backed by preallocated arrays, so recording a
+sample never allocates.
+"""
+import fcntl
+import struct
+import time
+from array import array
+
+# ioctl(EVIOCSCLOCKID): make evdev timestamp this client's events with
+# CLOCK_MONOTONIC instead of CLOCK_REALTIME
+EVIOCSCLOCKID = 0x400445A0
+CLOCK_MONOTONIC = 1
+
+_SUB_BITS = 4
+_SUB = 1 << _SUB_BITS
+_MAX_EXP = 36          # values up to ~2^40 ns (~18 min) before clamping
+_NUM_BUCKETS = (_MAX_EXP + 2) << _SUB_BITS
+
+
+def _bucket(v):
+    e = v.bit_length() - (_SUB_BITS + 1)
+    if e < 0:
+        e = 0
+    elif e > _MAX_EXP:
+        return _NUM_BUCKETS - 1
+    return (e << _SUB_BITS) + (v >> e)
+
+
+def _bucket_high(idx):
+    """Largest value that falls into bucket 'idx'."""
+    e = (idx >> _SUB_BITS) - 1
+    if e <= 0:
+        return idx
+    return ((idx - (e << _SUB_BITS) + 1) << e) - 1
+
+
+class LatencyHistogram:
+    """Streaming histogram of nanosecond durations."""
+
+    def __init__(self, name):
+        self.name = name
+        self.counts = array("Q", bytes(8 * _NUM_BUCKETS))
+        self.total = 0
+        self.max_ns = 0
+
+    def record(self, ns):
+        if ns < 0:
+            ns = 0
+        self.counts[_bucket(ns)] += 1
+        self.total += 1
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, p):
+        """Upper bound (ns) of the bucket holding the p-th percentile."""
+        if self.total == 0:
+            return 0
+        target = self.total * p / 100.0
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                return min(_bucket_high(idx), self.max_ns)
+        return self.max_ns
+
+    def summary(self):
+        if self.total == 0:
+            return f"{self.name:<16} no samples"
+        return (f"{self.name:<16} n={self.total:<7} "
+                f"p50={self.percentile(50) / 1e3:8.1f} us  "
+                f"p95={self.percentile(95) / 1e3:8.1f} us  "
+                f"p99={self.percentile(99) / 1e3:8.1f} us  "
+                f"max={self.max_ns / 1e3:8.1f} us")
+
+
+class LatencyTracker:
+    """Follows one frame at a time from kernel timestamp to PWM write."""
+
+    def __init__(self):
+        self.kernel_recv = LatencyHistogram("kernel→recv")
+        self.recv_decision = LatencyHistogram("recv→decision")
+        self.decision_pwm = LatencyHistogram("decision→pwm")
+        self.kernel_pwm = LatencyHistogram("kernel→pwm")
+        self.clock = time.time_ns   # must match the evdev timestamp clock
+
+        # Latest received frame (input side)
+        self.frame_kernel = 0
+        self.frame_recv = 0
+        self.frame_new = False
+        # Frame being actuated (control side)
+        self.act_kernel = 0
+        self.act_decision = 0
+        self.act_pending = False
+
+    def use_device_clock(self, fd):
+        """Ask evdev for CLOCK_MONOTONIC timestamps; keep realtime if refused."""
+        try:
+            fcntl.ioctl(fd, EVIOCSCLOCKID, struct.pack("i", CLOCK_MONOTONIC))
+            self.clock = time.monotonic_ns
+        except OSError as e:
+            print(f"[LATENCY] EVIOCSCLOCKID failed ({e}), using CLOCK_REALTIME")
+            self.clock = time.time_ns
+
+    def frame_received(self, sec, usec):
+        """Call on each SYN_REPORT with its kernel timestamp."""
+        now = self.clock()
+        kernel = sec * 1_000_000_000 + usec * 1000
+        self.kernel_recv.record(now - kernel)
+        self.frame_kernel = kernel
+        self.frame_recv = now
+        self.frame_new = True
+
+    def decision(self):
+        """Call when control consumes the latest frame."""
+        if not self.frame_new:
+            return
+        now = self.clock()
+        self.frame_new = False
+        self.recv_decision.record(now - self.frame_recv)
+        self.act_kernel = self.frame_kernel
+        self.act_decision = now
+        self.act_pending = True
+
+    def pwm_written(self):
+        """Call on each duty write that actually reached the hardware."""
+        if not self.act_pending:
+            return
+        now = self.clock()
+        self.act_pending = False
+        self.decision_pwm.record(now - self.act_decision)
+        self.kernel_pwm.record(now - self.act_kernel)
+
+    def lines(self):
+        return [h.summary() for h in
+                (self.kernel_recv, self.recv_decision, self.decision_pwm, self.kernel_pwm)]
+
+    def report(self):
+        print("[LATENCY] Input-to-actuation latency:")
+        for line in self.lines():
+            print("[LATENCY]   " + line)
+
+    def write(self, path):
+        with open(path, "w") as f:
+            f.write("\n".join(self.lines()) + "\n")
+        print(f"[LATENCY] Report written to {path}")
@@ -1,12 +1,37 @@
 #!/usr/bin/env python3
 import os
+import select
 import time
 import serial
 from serial import SerialException
 
-import RPi.GPIO as GPIO
 import signal
-from evdev import InputDevice, ecodes
+from evdev import InputDevice
+
+from curves import DutyTables, PIGPIO, SCALES, STICK_LOW, STICK_HIGH
+from mixer import MecanumMixer
+from wheels import WheelDrive, STOP_STRATEGIES, STOP_BRAKE_THEN_COAST
+from ramp import SlewLimiter
+from actuator import Actuator
+from audio_worker import AudioWorker
+from dfplayer import (
+    build_frame, wait_ready, READY_TIMEOUT, DEVICE_SD,
+    CMD_PLAY_TRACK, CMD_SET_VOLUME, CMD_STOP,
+)
+from motor_backends import MotorOutputs, SysfsPWM, create_backend, BACKENDS
+from control_tick import ControlTicker
+from latency import LatencyTracker
+from input_record import InputRecorder, replay
+from evdev_reader import RawEventReader, sync_state
+from input_filter import InputFilter
+from ds4_discovery import DS4Finder, ROLE_MOTION
+from watchdog import Watchdog
+from controller_state import (
+    ControllerState,
+    EV_SYN, EV_KEY, EV_ABS, SYN_REPORT, ABS_Y, ABS_RY, ABS_SLOTS, KEY_SLOTS,
+    LY, RY, L2, R2, HAT_X, HAT_Y, TRIANGLE, SHARE, OPTIONS,
+    BIT_TRIANGLE, BIT_HAT_X, BIT_HAT_Y, MOTION_BITS, MOTION_AXES, SHUTDOWN_BITS,
+)
 
 # OLED / luma
 from luma.core.interface.serial import i2c
@@ -14,13 +39,75 @@ from luma.core.render import canvas
 from luma.oled.device import ssd1306, sh1106
 
 import threading
+import asyncio
+import argparse
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 # ======================================================
 #                     GENERAL CONFIG
 # ======================================================
 
-DS4_PATH = "/dev/input/event4"
-GPIO.setmode(GPIO.BCM)
+# None → find the DS4 by name/capabilities (hotplug); set a path to pin it
+DS4_PATH = None
+
+# Response curves (0 = linear, 1 = fully cubic) baked into the duty tables
+STICK_EXPO = 0.0
+TRIGGER_EXPO = 0.0
+
+duty_tables = None  # DutyTables, built for the motor backend in setup_motors()
+
+# Drive mode: "tank" (each stick drives one side, triggers strafe and take
+# priority) or "mecanum" (sticks and triggers mixed together, see mixer.py)
+DRIVE_MODE = "tank"
+
+mixer = None  # MecanumMixer in mecanum mode, built in setup_motors()
+
+# How wheels commanded to 0 stop, per drive mode (see wheels.py):
+# "coast", "brake" (both IN high, EN on) or "brake_then_coast"
+STOP_MODES = {"tank": "coast", "mecanum": "coast"}
+STOP_MODE = None      # overrides STOP_MODES for every drive mode when set
+BRAKE_MS = 200        # brake_then_coast: brake time before coasting
+
+# Latency instrumentation: report file written at shutdown (None → print only)
+LATENCY_REPORT_PATH = None
+
+# Input recording / replay (see input_record.py)
+RECORD_PATH = None   # save the raw DS4 stream here
+REPLAY_PATH = None   # read input from this recording instead of the DS4
+REPLAY_SPEED = 1.0   # 1.0 = real time, 0 = as fast as possible
+
+# Motor control rate: 0 → run control once per input frame,
+# > 0 → run it at this fixed rate (Hz) on its own thread
+CONTROL_RATE_HZ = 0
+
+# Duty slew-rate limits, in % of full duty per ms (0 = no limit). The ramp
+# (and a timed brake) only advances in the control tick, which then runs at
+# RAMP_RATE_HZ at least.
+RAMP_ACCEL = 0.0
+RAMP_DECEL = 0.0
+RAMP_RATE_HZ = 100
+
+# Deadman: stop the motors when no input arrives for this long (0 = off)
+DEADMAN_MS = 150
+
+# How DS4 events are read: "evdev" (python-evdev read_loop, one InputEvent
+# per event) or "raw" (batched readinto + struct decode, see evdev_reader.py)
+INPUT_READER = "evdev"
+
+# Raw reader only: when input piles up (a stall, or a kernel queue overflow)
+# skip the stale frames and act once on the controller's current state
+CATCH_UP = False
+
+# Kernel-side input filtering (see input_filter.py): stick fuzz / flat in
+# raw counts, and an event mask down to the codes ControllerState uses
+INPUT_FILTER = True
+STICK_FUZZ = 4
+STICK_FLAT = (STICK_HIGH - STICK_LOW) // 2
+
+# Apply motor commands on their own thread (latest command wins), so a slow
+# backend never blocks the input loop or the control tick
+ACTUATOR_THREAD = False
 
 # ======================================================
 #                     DFPLAYER CONFIG
@@ -31,10 +118,17 @@ BAUD_RATE = 9600
 DFPLAYER_MAX_VOL = 30
 DFPLAYER_LOW_VOL = 15  # low volume preset
 
+DFPLAYER_READY_TIMEOUT = READY_TIMEOUT  # max wait for the module's "ready" frame
+
 df_ser = None      # global DFPlayer handler
 df_ready = False   # becomes True after first successful init
 df_current_volume = DFPLAYER_MAX_VOL  # track current volume
 
+# Readiness / time-to-first-sound measurements (see df_report)
+df_start_ns = None        # handshake started
+df_ready_info = None      # (answered, devices, seconds) from wait_ready()
+df_first_sound = None     # (ns after start, ns after the press) of the first track
+
 
 def df_open_serial():
     """Open DFPlayer serial port if not already open."""
@@ -53,25 +147,7 @@ def df_send(cmd, param):
     global df_ser
     df_open_serial()
 
-    start = 0x7E
-    version = 0xFF
-    length = 0x06
-    feedback = 0x00
-
-    paramH = (param >> 8) & 0xFF
-    paramL = param & 0xFF
-
-    checksum = 0 - (version + length + cmd + feedback + paramH + paramL)
-    checksum &= 0xFFFF
-    checksumH = (checksum >> 8) & 0xFF
-    checksumL = checksum & 0xFF
-
-    end = 0xEF
-
-    frame = bytes([
-        start, version, length, cmd, feedback,
-        paramH, paramL, checksumH, checksumL, end
-    ])
+    frame = build_frame(cmd, param)
 
     try:
         df_ser.write(frame)
@@ -91,7 +167,7 @@ def df_set_volume(vol):
     global df_current_volume
     vol = max(0, min(DFPLAYER_MAX_VOL, vol))
     df_current_volume = vol
-    df_send(0x06, vol)
+    df_send(CMD_SET_VOLUME, vol)
     print(f"[DFPLAYER] Volume command sent: {vol}")
 
 
@@ -100,25 +176,44 @@ def df_play_track(num):
     Play a track by number:
     e.g., 0001.mp3 → 1, 0002.mp3 → 2.
     """
-    df_send(0x03, num)
+    global df_first_sound
+
+    df_send(CMD_PLAY_TRACK, num)
+    if df_first_sound is None and df_start_ns is not None:
+        now = time.monotonic_ns()
+        pressed = audio_worker.current_queued_ns if audio_worker is not None else now
+        df_first_sound = (now - df_start_ns, now - pressed)
 
 
 def df_init_if_needed():
     """
     Lazily initialize DFPlayer on first use:
     - open serial
-    - wait a few seconds so module can fully boot
+    - wait for the module's "ready" frame (0x3F / 0x3A), at most
+      DFPLAYER_READY_TIMEOUT, instead of a fixed boot delay
     - set volume once (to current preset)
+    start_audio() queues it at program start, so the handshake is usually
+    over before the first button press.
     """
-    global df_ready
+    global df_ready, df_start_ns, df_ready_info
 
     if df_ready:
         return
 
-    print("[DFPLAYER] First-time init: opening serial and waiting...")
+    print("[DFPLAYER] Init: opening serial and waiting for the module...")
+    if df_start_ns is None:
+        df_start_ns = time.monotonic_ns()
     df_open_serial()
-    # Give MP3-TF-16P time to mount SD and be ready
-    time.sleep(3.0)
+    # MP3-TF-16P mounts the SD card after power-up, then reports 0x3F
+    answered, devices, seconds = wait_ready(df_ser, DFPLAYER_READY_TIMEOUT)
+    df_ready_info = (answered, devices, seconds)
+    if not answered:
+        print(f"[DFPLAYER] No answer after {seconds:.1f} s, assuming it is up")
+    elif not devices & DEVICE_SD:
+        print(f"[DFPLAYER] Ready after {seconds * 1000:.0f} ms, but no SD card online "
+              f"(devices 0x{devices:02x})")
+    else:
+        print(f"[DFPLAYER] Ready after {seconds * 1000:.0f} ms (SD card online)")
 
     try:
         df_set_volume(df_current_volume)
@@ -129,18 +224,72 @@ def df_init_if_needed():
     df_ready = True
 
 
+def df_report():
+    """Print how long the DFPlayer took to get ready and to play a first track."""
+    if df_ready_info is not None:
+        answered, _devices, seconds = df_ready_info
+        how = "module answered" if answered else "timeout, no answer"
+        print(f"[DFPLAYER] Ready after {seconds * 1000:.0f} ms ({how})")
+    if df_first_sound is not None:
+        since_start, since_press = df_first_sound
+        print(f"[DFPLAYER] Time to first sound: {since_start / 1e9:.2f} s after start, "
+              f"{since_press / 1e6:.1f} ms after its button press")
+
+
 def df_cleanup():
     """Try to gracefully stop DFPlayer before exit/reboot."""
     try:
         if df_ready:
             print("[DFPLAYER] Cleanup: sending STOP")
-            # 0x16 = STOP command in DFPlayer protocol
-            df_send(0x16, 0)
+            df_send(CMD_STOP, 0)
             time.sleep(0.1)
     except Exception as e:
         print(f"[DFPLAYER] Cleanup error (ignored): {e}")
 
 
+audio_worker = None  # AudioWorker running every DFPlayer action
+
+
+def start_audio():
+    """Send every DFPlayer action to its own thread; control never waits on serial."""
+    global audio_worker, dispatch_audio
+
+    audio_worker = AudioWorker()
+    audio_worker.start()
+    dispatch_audio = audio_worker.post
+    # Handshake with the DFPlayer now, not on the first button press
+    audio_worker.post(df_init_if_needed)
+
+
+def stop_audio():
+    global audio_worker, dispatch_audio
+
+    if audio_worker is None:
+        return
+    dispatch_audio = _call_inline
+    audio_worker.stop()
+    audio_worker.report()
+    audio_worker = None
+
+
+def audio_toggle_volume():
+    """Triangle action: toggle volume between the max and low presets."""
+    df_init_if_needed()
+    # Decide next volume
+    if df_current_volume > DFPLAYER_LOW_VOL:
+        new_vol = DFPLAYER_LOW_VOL
+    else:
+        new_vol = DFPLAYER_MAX_VOL
+    df_set_volume(new_vol)
+    print(f"[DFPLAYER] Triangle pressed → volume toggled to {new_vol}")
+
+
+def audio_play(num):
+    """D-pad action: make sure DFPlayer is ready and play a track."""
+    df_init_if_needed()
+    df_play_track(num)
+
+
 # ======================================================
 #                        OLED
 # ======================================================
@@ -257,13 +406,25 @@ def draw_angry(device):
         draw.arc(mouth_box, start=200, end=340, fill=255)
 
 
+def oled_draw_face(face):
+    """Draw the "happy" or "angry" face (blocking I2C transfer)."""
+    global oled_face_state
+
+    if face == "happy":
+        print("[OLED] Drawing HAPPY face")
+        draw_happy(oled_device)
+    else:
+        print("[OLED] Drawing ANGRY face")
+        draw_angry(oled_device)
+
+    oled_face_state = face
+
+
 def oled_worker():
     """
     Background thread that updates the OLED face.
     It only reads the global 'is_moving' and draws when state changes.
     """
-    global oled_face_state
-
     print("[OLED] Worker thread started")
     last_state = None
 
@@ -277,14 +438,7 @@ def oled_worker():
 
             if current != last_state:
                 # Only redraw when the movement state changes
-                if current == "happy":
-                    print("[OLED] Drawing HAPPY face")
-                    draw_happy(oled_device)
-                else:
-                    print("[OLED] Drawing ANGRY face")
-                    draw_angry(oled_device)
-
-                oled_face_state = current
+                oled_draw_face(current)
                 last_state = current
 
             time.sleep(0.1)  # limit update rate
@@ -324,7 +478,7 @@ R_IN4 = 8
 R_ENA = 18
 R_ENB = 12
 
-PWM_FREQ = 1000  # Hz
+PWM_FREQ = 1000  # Hz, RPi.GPIO software PWM
 
 # Pin groups
 LEFT_DIR_PINS = [L_IN1, L_IN2, L_IN3, L_IN4]
@@ -334,41 +488,127 @@ RIGHT_PWM_PINS = [R_ENA, R_ENB]
 
 ALL_PINS = LEFT_DIR_PINS + RIGHT_DIR_PINS + LEFT_PWM_PINS + RIGHT_PWM_PINS
 
-# PWM handlers
-pwm_L_ENA = None
-pwm_L_ENB = None
-pwm_R_ENA = None
-pwm_R_ENB = None
-
-
-def setup_gpio():
-    """Configure all GPIO pins and initialize PWM modules."""
-    global pwm_L_ENA, pwm_L_ENB, pwm_R_ENA, pwm_R_ENB
-
-    # Set all pins as OUTPUT
-    for pin in ALL_PINS:
-        GPIO.setup(pin, GPIO.OUT)
-
-    # Initialize PWM objects
-    pwm_L_ENA = GPIO.PWM(L_ENA, PWM_FREQ)
-    pwm_L_ENB = GPIO.PWM(L_ENB, PWM_FREQ)
-    pwm_R_ENA = GPIO.PWM(R_ENA, PWM_FREQ)
-    pwm_R_ENB = GPIO.PWM(R_ENB, PWM_FREQ)
-
-    for pwm in (pwm_L_ENA, pwm_L_ENB, pwm_R_ENA, pwm_R_ENB):
-        pwm.start(0)
+# Wheel -> (IN pin high for forward, IN pin high for backward, EN pin)
+WHEEL_PINS = {
+    "FL": (L_IN1, L_IN2, L_ENA),
+    "FR": (R_IN3, R_IN4, R_ENB),
+    "RL": (L_IN3, L_IN4, L_ENB),
+    "RR": (R_IN2, R_IN1, R_ENA),
+}
+
+# Per-wheel duty factor (1.0 = as commanded) to even out motor speeds
+WHEEL_TRIM = {"FL": 1.0, "FR": 1.0, "RL": 1.0, "RR": 1.0}
+
+
+MOTOR_BACKEND = "rpigpio"   # "rpigpio" | "pigpio" | "gpiomem" | "gpiod" | "sim"
+SIM_LOG_PATH = None         # sim backend: save every command here at exit
+GPIOCHIP_PATH = "/dev/gpiochip0"   # gpiod backend: GPIO character device
+PWM_MODE = "soft"           # "soft" | "hw": EN pins from /sys/class/pwm (rpigpio, gpiomem, gpiod)
+
+motor_out = None            # MotorOutputs over the selected backend
+motor_lock = threading.Lock()   # one writer at a time: control, actuator or the deadman
+actuator = None             # Actuator when ACTUATOR_THREAD is set
+wheels = None               # WheelDrive: the four wheel commands on top of motor_out
+
+
+def setup_motors(backend_name=None):
+    """Create the motor backend, configure its pins and build duty tables."""
+    global motor_out, duty_tables, wheels, mixer, actuator
+
+    name = backend_name or MOTOR_BACKEND
+    kwargs = {}
+    if name == "rpigpio":
+        kwargs["freq"] = PWM_FREQ
+    elif name == "gpiod":
+        kwargs["chip_path"] = GPIOCHIP_PATH
+    elif name == "sim":
+        kwargs["log_path"] = SIM_LOG_PATH
+    if PWM_MODE == "hw" and name in ("rpigpio", "gpiomem", "gpiod"):
+        kwargs["duty_backend"] = SysfsPWM(LEFT_PWM_PINS + RIGHT_PWM_PINS)
+
+    backend = create_backend(name, LEFT_DIR_PINS + RIGHT_DIR_PINS,
+                             LEFT_PWM_PINS + RIGHT_PWM_PINS, **kwargs)
+    motor_out = MotorOutputs(backend)
+    check_pwm_pairs(motor_out.pwm_channels())
+    motor_out.setup()
+    if latency is not None:
+        motor_out.on_duty_write = latency.pwm_written
+    ramp = None
+    if RAMP_ACCEL > 0 or RAMP_DECEL > 0:
+        ramp = SlewLimiter(SCALES[backend.duty_scale][1], RAMP_ACCEL, RAMP_DECEL,
+                           integer=backend.duty_scale == PIGPIO)
+    wheels = WheelDrive(motor_out, WHEEL_PINS, WHEEL_TRIM, ramp,
+                        stop=stop_strategy(), brake_duty=SCALES[backend.duty_scale][1],
+                        brake_ms=BRAKE_MS)
+
+    # Duty tables in the units this backend expects
+    duty_tables = DutyTables(backend.duty_scale, STICK_EXPO, TRIGGER_EXPO)
+    if DRIVE_MODE == "mecanum":
+        mixer = MecanumMixer(backend.duty_scale, STICK_EXPO, TRIGGER_EXPO)
+    print(f"[MOTOR] Backend: {backend.name} (duty scale: {backend.duty_scale})")
+
+    if ACTUATOR_THREAD:
+        actuator = Actuator(wheels, motor_lock)
+        actuator.start()
+
+
+def check_pwm_pairs(channels):
+    """
+    Two EN pins on one hardware PWM channel ({EN pin: channel}) get a single
+    duty, the higher one: refuse to start when their wheels need different
+    duties (mecanum mixing, or a different WHEEL_TRIM within the pair).
+    """
+    if not channels:
+        return
+    pairs = {}
+    for wheel, (_fwd, _bwd, en) in WHEEL_PINS.items():
+        if en in channels:
+            pairs.setdefault(channels[en], []).append(wheel)
+    for ch, members in sorted(pairs.items()):
+        if len(members) < 2:
+            continue
+        names = "/".join(members)
+        if DRIVE_MODE == "mecanum":
+            raise SystemExit(
+                f"[MOTOR] --drive mecanum needs a duty per wheel, but {names} share "
+                f"PWM channel {ch}: use --backend rpigpio with --pwm soft")
+        if len({WHEEL_TRIM[wheel] for wheel in members}) > 1:
+            raise SystemExit(
+                f"[MOTOR] WHEEL_TRIM differs between {names}, which share PWM "
+                f"channel {ch}: give both the same trim or use --pwm soft")
+
+
+def stop_actuator():
+    global actuator
+
+    if actuator is None:
+        return
+    actuator.stop()
+    actuator.report()
+    actuator = None
 
 
 # ======================================================
 #                    DS4 HELPERS
 # ======================================================
 
-BTN_SHARE = 314
-BTN_OPTIONS = 315
+ds4_finder = None  # DS4Finder, created on first use
+
+
+def reconnect_delay(path):
+    """Pause after a disconnect: hotplug discovery needs (almost) none."""
+    return 1.0 if path is not None else 0.05
 
 
 def esperar_ds4(path, retry_delay=1.0):
     """Wait until the DS4 appears and can be accessed without errors."""
+    global ds4_finder
+
+    if path is None:
+        if ds4_finder is None:
+            ds4_finder = DS4Finder()
+        return ds4_finder.wait(poll_delay=retry_delay)
+
     while True:
         try:
             dev = InputDevice(path)
@@ -382,16 +622,191 @@ def esperar_ds4(path, retry_delay=1.0):
         time.sleep(retry_delay)
 
 
+input_filter = None  # InputFilter of the connected DS4
+
+
+def filter_input(dev):
+    """Drop stick jitter and unused events in the kernel (INPUT_FILTER)."""
+    global input_filter
+
+    if not INPUT_FILTER:
+        return
+    absinfo = {ABS_Y: (STICK_FUZZ, STICK_FLAT), ABS_RY: (STICK_FUZZ, STICK_FLAT)}
+    input_filter = InputFilter(dev.fd, absinfo, ABS_SLOTS, KEY_SLOTS)
+    input_filter.apply()
+
+
+def unfilter_input():
+    """Give the device its original fuzz/flat back before letting it go."""
+    global input_filter
+
+    if input_filter is not None:
+        input_filter.restore()
+        input_filter = None
+
+
 def check_shutdown_combo(estado):
     """Shutdown Raspberry Pi when SHARE + OPTIONS are pressed."""
-    share = estado.get(BTN_SHARE, 0)
-    options = estado.get(BTN_OPTIONS, 0)
+    v = estado.values
 
-    if share == 1 and options == 1:
+    if v[SHARE] == 1 and v[OPTIONS] == 1:
         print("[POWER] SHARE + OPTIONS detected → Shutting down...")
         os.system("sudo shutdown -h now")
 
 
+# ======================================================
+#                    INPUT FRAMES
+# ======================================================
+
+class FrameStats:
+    """
+    Counts how many evdev events were folded into each SYN_REPORT frame.
+    Every event beyond the first in a frame is one control run saved.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.events = 0
+        self.max_events = 0
+        self.pending = 0
+
+    def add_event(self):
+        self.pending += 1
+
+    def end_frame(self):
+        """Close the current frame and return how many events it held."""
+        n = self.pending
+        self.pending = 0
+        self.frames += 1
+        self.events += n
+        if n > self.max_events:
+            self.max_events = n
+        return n
+
+    def report(self):
+        if self.frames == 0:
+            print("[INPUT] No frames processed.")
+            return
+        avg = self.events / self.frames
+        saved = self.events - self.frames
+        print(f"[INPUT] {self.frames} frames, {self.events} events "
+              f"(avg {avg:.2f}/frame, max {self.max_events}), "
+              f"{saved} control runs saved")
+
+
+frame_stats = FrameStats()
+
+latency = None   # LatencyTracker when --latency is given
+recorder = None  # InputRecorder when --record is given
+raw_reader = None  # RawEventReader when INPUT_READER is "raw"
+
+
+def _call_inline(fn, *args):
+    fn(*args)
+
+
+# Where run_frame sends blocking side effects (DFPlayer serial I/O and the
+# shutdown check). Both runtimes hand audio to the AudioWorker thread
+# (start_audio); the asyncio runtime also moves the shutdown check to a task.
+dispatch_audio = _call_inline
+dispatch_power = check_shutdown_combo
+
+
+def handle_input_event(estado, etype, code, value, sec=0, usec=0):
+    """
+    Fold one evdev event into the controller state.
+    Control and the shutdown combo run once per SYN_REPORT, with every
+    axis and button of that report already applied.
+    Returns True when the event closed a frame.
+    """
+    if recorder is not None:
+        recorder.record(sec, usec, etype, code, value)
+
+    if etype == EV_SYN:
+        if code != SYN_REPORT:
+            return False
+        if latency is not None:
+            latency.frame_received(sec, usec)
+        if deadman is not None:
+            deadman.feed()
+        frame_stats.end_frame()
+        run_frame(estado, estado.take_changed())
+        return True
+
+    if etype == EV_ABS or etype == EV_KEY:
+        estado.update(etype, code, value)
+        frame_stats.add_event()
+
+    return False
+
+
+def handle_stale_event(estado, etype, code, value, sec=0, usec=0):
+    """
+    Event drained by a catch-up. Buttons and the D-pad still go through
+    handle_input_event (a tap inside the backlog is not lost); stale stick
+    and trigger positions are only recorded, catch_up_input() loads the
+    current ones.
+    """
+    if etype == EV_ABS and code in MOTION_AXES:
+        if recorder is not None:
+            recorder.record(sec, usec, etype, code, value)
+        return False
+    return handle_input_event(estado, etype, code, value, sec, usec)
+
+
+def catch_up_input(estado, fd, sec, usec):
+    """
+    The raw reader skipped a backlog: load the controller's current state
+    and run it as one frame. sec/usec stamp the newest skipped event.
+    """
+    if latency is not None:
+        latency.frame_received(sec, usec)
+    if deadman is not None:
+        deadman.feed()
+    sync_state(fd, estado)
+    frame_stats.end_frame()
+    run_frame(estado, estado.take_changed())
+
+
+def run_frame(estado, changed):
+    """React to one complete DS4 report, given the mask of slots it changed."""
+    v = estado.values
+
+    # ---------- TRIANGLE: VOLUME TOGGLE 30 ↔ 15 ----------
+    if changed & BIT_TRIANGLE and v[TRIANGLE] == 1:
+        dispatch_audio(audio_toggle_volume)
+
+    # ---------- D-PAD AUDIO ----------
+    if changed & BIT_HAT_Y:
+        hat = v[HAT_Y]
+        if hat == -1:
+            print("[AUDIO] ↑ → Track 1")
+            dispatch_audio(audio_play, 1)
+        elif hat == 1:
+            print("[AUDIO] ↓ → Track 3")
+            dispatch_audio(audio_play, 3)
+
+    if changed & BIT_HAT_X:
+        hat = v[HAT_X]
+        if hat == -1:
+            print("[AUDIO] ← → Track 4")
+            dispatch_audio(audio_play, 4)
+        elif hat == 1:
+            print("[AUDIO] → → Track 2")
+            dispatch_audio(audio_play, 2)
+
+    # ---------- ROBOT CONTROL ----------
+    if changed & MOTION_BITS:
+        if control_ticker is None:
+            if latency is not None:
+                latency.decision()
+            logica_control(estado)
+        else:
+            publish_controls(estado)
+    if changed & SHUTDOWN_BITS:
+        dispatch_power(estado)
+
+
 # ======================================================
 #                    CONTROL LOGIC
 # ======================================================
@@ -403,172 +818,267 @@ def logica_control(estado):
     """
     global is_moving
 
-    y = estado.get(ecodes.ABS_Y, 127)
-    x = estado.get(ecodes.ABS_RY, 127)
-    lz = estado.get(ecodes.ABS_Z, 0)
-    rz = estado.get(ecodes.ABS_RZ, 0)
+    if mixer is not None:
+        mecanum_control(estado)
+        return
 
-    moving = False
+    v = estado.values
+    lz = v[L2]
+    rz = v[R2]
 
     # ---------- LATERAL MOVEMENT PRIORITY ----------
     if lz > 0:
-        left_lateral_movement(lz)
-        moving = True
+        left_lateral_movement(duty_tables.l2[lz])
     elif rz > 0:
-        right_lateral_movement(rz)
-        moving = True
+        right_lateral_movement(duty_tables.r2[rz])
     else:
         # ---------- FORWARD / BACKWARD ----------
-        # Left side
-        if y > 140:
-            left_axis_backward(y)
-            moving = True
-        elif y < 120:
-            left_axis_forward(y)
-            moving = True
-        else:
-            stop_left()
-
-        # Right side
-        if x > 140:
-            right_axis_backward(x)
-            moving = True
-        elif x < 120:
-            right_axis_forward(x)
-            moving = True
-        else:
-            stop_right()
+        # Signed duty: > 0 forward, < 0 backward, 0 inside the deadzone
+        tank_movement(duty_tables.ly[v[LY]], duty_tables.ry[v[RY]])
+
+    is_moving = wheels_moving()
 
-    is_moving = moving
+
+def mecanum_control(estado):
+    """Combined motion: strafe, drive and rotate at once through the mixer."""
+    global is_moving
+
+    v = estado.values
+    fl, fr, rl, rr = mixer.mix_controls(v[LY], v[RY], v[L2], v[R2])
+    command_wheels(fl, fr, rl, rr)
+    is_moving = wheels_moving()
 
 
 # ======================================================
-#              LINEAR MOVEMENT FUNCTIONS
+#                    CONTROL TICK
 # ======================================================
 
-def left_axis_backward(y):
-    """Move both left motors backward."""
-    GPIO.output(L_IN1, 0)
-    GPIO.output(L_IN2, 1)
-    GPIO.output(L_IN3, 0)
-    GPIO.output(L_IN4, 1)
+control_ticker = None          # ControlTicker when CONTROL_RATE_HZ > 0
+control_lock = threading.Lock()
+shared_state = ControllerState()  # latest complete frame, written by input
+tick_state = ControllerState()    # private copy used inside the tick
+
+
+def publish_controls(estado):
+    """Hand the latest complete frame to the control tick."""
+    with control_lock:
+        shared_state.values[:] = estado.values
+
 
-    pwm_val = (y - 140) * 100 / 115
-    pwm_L_ENA.ChangeDutyCycle(pwm_val)
-    pwm_L_ENB.ChangeDutyCycle(pwm_val)
+def control_tick(now_ns):
+    """One fixed-rate control step: sample the latest frame and apply it."""
+    with control_lock:
+        tick_state.values[:] = shared_state.values
+        if latency is not None:
+            latency.decision()
+    logica_control(tick_state)
 
 
-def left_axis_forward(y):
-    """Move both left motors forward."""
-    GPIO.output(L_IN1, 1)
-    GPIO.output(L_IN2, 0)
-    GPIO.output(L_IN3, 1)
-    GPIO.output(L_IN4, 0)
+def start_control_ticker(rate_hz):
+    global control_ticker
+
+    if rate_hz <= 0:
+        return
+    shared_state.reset()
+    control_ticker = ControlTicker(rate_hz, control_tick)
+    control_ticker.start()
 
-    pwm_val = (120 - y) * 100 / 120
-    pwm_L_ENA.ChangeDutyCycle(pwm_val)
-    pwm_L_ENB.ChangeDutyCycle(pwm_val)
 
+def stop_control_ticker():
+    global control_ticker
+
+    if control_ticker is None:
+        return
+    control_ticker.stop()
+    control_ticker.report()
+    control_ticker = None
 
-def right_axis_backward(x):
-    """Move both right motors backward."""
-    GPIO.output(R_IN1, 1)
-    GPIO.output(R_IN2, 0)
-    GPIO.output(R_IN3, 0)
-    GPIO.output(R_IN4, 1)
 
-    pwm_val = (x - 140) * 100 / 115
-    pwm_R_ENA.ChangeDutyCycle(pwm_val)
-    pwm_R_ENB.ChangeDutyCycle(pwm_val)
+def halt_motors():
+    """Hard stop of every wheel (no ramp), also for the control tick."""
+    global is_moving
 
+    if control_ticker is not None:
+        # Keep the tick from re-applying the last (stale) frame
+        with control_lock:
+            shared_state.reset()
+    with motor_lock:
+        stop_wheels(immediate=True)
+    is_moving = False
 
-def right_axis_forward(x):
-    """Move both right motors forward."""
-    GPIO.output(R_IN1, 0)
-    GPIO.output(R_IN2, 1)
-    GPIO.output(R_IN3, 1)
-    GPIO.output(R_IN4, 0)
 
-    pwm_val = (120 - x) * 100 / 120
-    pwm_R_ENA.ChangeDutyCycle(pwm_val)
-    pwm_R_ENB.ChangeDutyCycle(pwm_val)
+def release_controls(estado):
+    """Controller lost: back to the resting state and stop the motors now."""
+    estado.reset()
+    halt_motors()
 
 
 # ======================================================
-#                 LATERAL MECANUM MOVEMENT
+#                  DEADMAN WATCHDOG
 # ======================================================
+#
+# The gamepad node only reports changes: with the sticks held still it is
+# silent, just like a stalled Bluetooth link. The DS4 "Motion Sensors" node
+# streams IMU reports continuously, so it feeds the deadman as a heartbeat
+# and only a real loss of the controller lets the deadline expire. Without
+# that node a held stick cannot be told from a lost link (the fuzz filter
+# even silences resting jitter), so the deadman is only armed while a
+# heartbeat is attached.
 
-def _trigger_to_pwm(val):
-    """Convert trigger value (0–255) to PWM duty cycle (0–100)."""
-    return int(val * 100 / 255)
+deadman = None   # Watchdog when DEADMAN_MS > 0
+heartbeat_attached = False   # heartbeat_worker is reading the motion node
 
 
-def left_lateral_movement(lz):
-    """Move robot LEFT using mecanum wheels (L2)."""
-    GPIO.output(R_IN1, 1)
-    GPIO.output(R_IN2, 0)
-    GPIO.output(R_IN3, 1)
-    GPIO.output(R_IN4, 0)
+def deadman_stop():
+    """Deadman trip: no input within the deadline, stop every wheel now."""
+    halt_motors()
 
-    GPIO.output(L_IN1, 0)
-    GPIO.output(L_IN2, 1)
-    GPIO.output(L_IN3, 1)
-    GPIO.output(L_IN4, 0)
 
-    pwm = _trigger_to_pwm(lz)
-    pwm_R_ENA.ChangeDutyCycle(pwm)
-    pwm_R_ENB.ChangeDutyCycle(pwm)
-    pwm_L_ENA.ChangeDutyCycle(pwm)
-    pwm_L_ENB.ChangeDutyCycle(pwm)
+def deadman_armed():
+    """Trip only with a heartbeat attached and the wheels running."""
+    return heartbeat_attached and wheels_moving()
 
 
-def right_lateral_movement(rz):
-    """Move robot RIGHT using mecanum wheels (R2)."""
-    GPIO.output(R_IN1, 0)
-    GPIO.output(R_IN2, 1)
-    GPIO.output(R_IN3, 0)
-    GPIO.output(R_IN4, 1)
+def heartbeat_worker():
+    """Feed the deadman on every read from the DS4 motion sensors node."""
+    global heartbeat_attached
 
-    GPIO.output(L_IN1, 1)
-    GPIO.output(L_IN2, 0)
-    GPIO.output(L_IN3, 0)
-    GPIO.output(L_IN4, 1)
+    warned = False
+    while True:
+        dev = ds4_finder.find(ROLE_MOTION)
+        if dev is None:
+            if not warned:
+                print("[WATCHDOG] No motion sensors node yet: deadman disarmed "
+                      "until it appears")
+                warned = True
+            time.sleep(1.0)
+            continue
+
+        print(f"[WATCHDOG] Heartbeat from {dev.name} at {dev.path}")
+        warned = False
+        fd = dev.fd
+        deadman.feed()   # the silence before attaching is not a lost link
+        heartbeat_attached = True
+        try:
+            # Raw reads: the content does not matter, only that it arrives.
+            # The fd is O_NONBLOCK (InputDevice): wait in select(), and an
+            # empty queue (BlockingIOError) just means "wait again".
+            while True:
+                select.select([fd], [], [])
+                try:
+                    data = os.read(fd, 4096)
+                except BlockingIOError:
+                    continue
+                if not data:
+                    raise OSError("end of file on motion sensors node")
+                deadman.feed()
+        except OSError as e:
+            print(f"[WATCHDOG] Heartbeat lost: {e}")
+        finally:
+            heartbeat_attached = False
+            dev.close()
+        # Let a vanishing node disappear before looking for it again
+        time.sleep(1.0)
 
-    pwm = _trigger_to_pwm(rz)
-    pwm_R_ENA.ChangeDutyCycle(pwm)
-    pwm_R_ENB.ChangeDutyCycle(pwm)
-    pwm_L_ENA.ChangeDutyCycle(pwm)
-    pwm_L_ENB.ChangeDutyCycle(pwm)
+
+def start_deadman(deadline_ms, heartbeat=True):
+    global deadman, ds4_finder
+
+    if deadline_ms <= 0:
+        return
+    deadman = Watchdog(deadline_ms, deadman_stop,
+                       active=deadman_armed if heartbeat else wheels_moving)
+    deadman.start()
+    if heartbeat:
+        if ds4_finder is None:
+            ds4_finder = DS4Finder()
+        threading.Thread(target=heartbeat_worker, name="ds4-heartbeat",
+                         daemon=True).start()
+
+
+def stop_deadman():
+    global deadman
+
+    if deadman is None:
+        return
+    deadman.stop()
+    deadman.report()
+    deadman = None
 
 
 # ======================================================
-#                       STOP FUNCTIONS
+#              LINEAR MOVEMENT FUNCTIONS
 # ======================================================
+#
+# Every movement is a full {FL, FR, RL, RR} command applied in one step
+# (see wheels.py): signed duty per wheel, > 0 forward.
+
+def command_wheels(fl, fr, rl, rr):
+    """Send a wheel command: to the actuator thread, or straight to the motors."""
+    if actuator is not None:
+        actuator.post(fl, fr, rl, rr)
+    else:
+        with motor_lock:
+            wheels.drive(fl, fr, rl, rr)
+
+
+def wheels_moving():
+    """True while a wheel is commanded, still ramping down or braking."""
+    if actuator is not None:
+        return actuator.moving
+    return wheels.moving
 
-def _stop_side(dir_pins, pwm_a, pwm_b):
-    """Generic helper to stop one side of the robot."""
-    for pin in dir_pins:
-        GPIO.output(pin, 0)
-    pwm_a.ChangeDutyCycle(0)
-    pwm_b.ChangeDutyCycle(0)
 
+def tank_movement(left, right):
+    """Each side at its own signed duty (left stick / right stick)."""
+    command_wheels(left, right, left, right)
 
-def stop_left():
-    """Stop all left motors."""
-    _stop_side(LEFT_DIR_PINS, pwm_L_ENA, pwm_L_ENB)
 
+# ======================================================
+#                 LATERAL MECANUM MOVEMENT
+# ======================================================
+
+def left_lateral_movement(pwm):
+    """Move robot LEFT using mecanum wheels (L2) at the given duty."""
+    command_wheels(-pwm, pwm, pwm, -pwm)
 
-def stop_right():
-    """Stop all right motors."""
-    _stop_side(RIGHT_DIR_PINS, pwm_R_ENA, pwm_R_ENB)
+
+def right_lateral_movement(pwm):
+    """Move robot RIGHT using mecanum wheels (R2) at the given duty."""
+    command_wheels(pwm, -pwm, -pwm, pwm)
+
+
+# ======================================================
+#                       STOP FUNCTIONS
+# ======================================================
+
+def stop_wheels(immediate=False):
+    """
+    Stop all four wheels now ('immediate' bypasses the duty ramp), dropping
+    any command still waiting for the actuator. Call with motor_lock held.
+    """
+    if actuator is not None:
+        actuator.discard()
+    wheels.stop(immediate)
+
+
+def stop_strategy():
+    """Stop strategy of the current drive mode."""
+    return STOP_MODE or STOP_MODES[DRIVE_MODE]
 
 
 def stop_everything():
-    """Stop the entire robot and clean GPIO."""
+    """Stop the entire robot and release the motor backend."""
     print("Stopping everything...")
-    stop_left()
-    stop_right()
-    GPIO.cleanup()
+    if motor_out is None:
+        return
+    stop_wheels(immediate=True)
+    wheels.settle()
+    wheels.report()
+    if wheels.ramp is not None:
+        wheels.ramp.report()
+    motor_out.report()
+    motor_out.cleanup()
 
 
 def _handle_sigterm(signum, frame):
@@ -578,17 +1088,85 @@ def _handle_sigterm(signum, frame):
 
 signal.signal(signal.SIGTERM, _handle_sigterm)
 
+
+def enable_latency():
+    """Start latency instrumentation; 'kill -USR1 <pid>' prints it on demand."""
+    global latency
+
+    latency = LatencyTracker()
+    signal.signal(signal.SIGUSR1, lambda signum, frame: latency.report())
+    print("[LATENCY] Instrumentation on (SIGUSR1 prints the histograms)")
+
+
+def report_latency(path=None):
+    if latency is None:
+        return
+    latency.report()
+    if path is not None:
+        try:
+            latency.write(path)
+        except OSError as e:
+            print(f"[LATENCY] Could not write {path}: {e}")
+
 # ======================================================
 #                         MAIN
 # ======================================================
 
+def replay_input(estado):
+    """Drive the whole input pipeline from a recording instead of the DS4."""
+    if latency is not None:
+        # replay() stamps events with CLOCK_MONOTONIC
+        latency.clock = time.monotonic_ns
+    replay(REPLAY_PATH,
+           lambda etype, code, value, sec, usec:
+               handle_input_event(estado, etype, code, value, sec, usec),
+           REPLAY_SPEED)
+    release_controls(estado)
+
+
+def shutdown_runtime():
+    """Common cleanup for both runtimes: display, audio, motors, serial."""
+    frame_stats.report()
+    if raw_reader is not None:
+        raw_reader.report()
+    stop_deadman()
+    stop_control_ticker()
+    stop_actuator()
+    if mixer is not None:
+        mixer.report()
+    report_latency(LATENCY_REPORT_PATH)
+    if recorder is not None:
+        recorder.close()
+    oled_power_off()
+    # Try to stop DFPlayer nicely
+    stop_audio()
+    df_report()
+    df_cleanup()
+
+    stop_everything()
+    try:
+        if df_ser is not None and df_ser.is_open:
+            df_ser.close()
+    except Exception:
+        pass
+    if ds4_finder is not None:
+        ds4_finder.close()
+    print("Program terminated.")
+
+
 def main():
+    """Threaded runtime: blocking evdev loop + OLED worker thread."""
     global is_moving, oled_thread, oled_thread_stop
 
-    estado = {}
+    estado = ControllerState()
     dev = None
 
-    setup_gpio()
+    setup_motors()
+    start_control_ticker(CONTROL_RATE_HZ)
+    start_audio()
+    # A replay has no link to lose (and no heartbeat to tell a held stick apart)
+    if REPLAY_PATH is None:
+        start_deadman(DEADMAN_MS)
 
     # Initialize OLED
     init_oled()
@@ -602,66 +1180,41 @@ def main():
     is_moving = False
 
     try:
+        if REPLAY_PATH is not None:
+            replay_input(estado)
+            return
+
         while True:
             dev = esperar_ds4(DS4_PATH)
 
             try:
                 dev.grab()
+                filter_input(dev)
                 print("DS4 ready — reading events...")
-
-                for event in dev.read_loop():
-                    # Update state
-                    if event.type in (ecodes.EV_ABS, ecodes.EV_KEY):
-                        estado[event.code] = event.value
-
-                    # ---------- TRIANGLE: VOLUME TOGGLE 30 ↔ 15 ----------
-                    if event.type == ecodes.EV_KEY and event.code == ecodes.BTN_NORTH:
-                        # value == 1: button pressed, 0: released
-                        if event.value == 1:
-                            df_init_if_needed()
-                            # Decide next volume
-                            if df_current_volume > DFPLAYER_LOW_VOL:
-                                new_vol = DFPLAYER_LOW_VOL
-                            else:
-                                new_vol = DFPLAYER_MAX_VOL
-                            df_set_volume(new_vol)
-                            print(f"[DFPLAYER] Triangle pressed → volume toggled to {new_vol}")
-
-                    # ---------- D-PAD AUDIO ----------
-                    if event.type == ecodes.EV_ABS and event.code == ecodes.ABS_HAT0Y:
-                        if event.value in (-1, 1):
-                            df_init_if_needed()
-                        if event.value == -1:
-                            print("[AUDIO] ↑ → Track 1")
-                            df_play_track(1)
-                        elif event.value == 1:
-                            print("[AUDIO] ↓ → Track 3")
-                            df_play_track(3)
-
-                    elif event.type == ecodes.EV_ABS and event.code == ecodes.ABS_HAT0X:
-                        if event.value in (-1, 1):
-                            df_init_if_needed()
-                        if event.value == -1:
-                            print("[AUDIO] ← → Track 4")
-                            df_play_track(4)
-                        elif event.value == 1:
-                            print("[AUDIO] → → Track 2")
-                            df_play_track(2)
-
-                    # ---------- ROBOT CONTROL ----------
-                    logica_control(estado)
-                    check_shutdown_combo(estado)
+                if latency is not None:
+                    latency.use_device_clock(dev.fd)
+                # Forget stale input from the previous connection
+                estado.reset()
+
+                if raw_reader is not None:
+                    raw_reader.read_loop(
+                        dev.fd, functools.partial(handle_input_event, estado),
+                        functools.partial(catch_up_input, estado) if CATCH_UP else None,
+                        functools.partial(handle_stale_event, estado))
+                else:
+                    for event in dev.read_loop():
+                        handle_input_event(estado, event.type, event.code, event.value,
+                                           event.sec, event.usec)
 
             except OSError as e:
                 print(f"\n[DS4] Controller disconnected: {e}")
-                stop_left()
-                stop_right()
-                is_moving = False
+                release_controls(estado)
                 print("[DS4] Waiting for reconnection...")
-                time.sleep(1)
+                time.sleep(reconnect_delay(DS4_PATH))
 
             finally:
                 if dev is not None:
+                    unfilter_input()
                     try:
                         dev.ungrab()
                     except Exception:
@@ -679,19 +1232,309 @@ def main():
                 oled_thread.join(timeout=1.0)
             except Exception:
                 pass
-        oled_power_off()
-        # Try to stop DFPlayer nicely
-        df_cleanup()
+        shutdown_runtime()
+
+
+# ======================================================
+#                    ASYNCIO RUNTIME
+# ======================================================
 
-        stop_everything()
+async def esperar_ds4_async(path, retry_delay=1.0):
+    """Same as esperar_ds4, but waits without blocking the event loop."""
+    global ds4_finder
+
+    if path is None:
+        if ds4_finder is None:
+            ds4_finder = DS4Finder()
+        return await ds4_finder.wait_async(poll_delay=retry_delay)
+
+    while True:
         try:
-            if df_ser is not None and df_ser.is_open:
-                df_ser.close()
-        except Exception:
-            pass
-        print("Program terminated.")
+            dev = InputDevice(path)
+            print(f"[DS4] Detected: {dev.name}")
+            return dev
+        except FileNotFoundError:
+            print(f"[DS4] {path} not found. Connect controller...")
+        except OSError as e:
+            print(f"[DS4] Device not ready ({e}). Retrying...")
+
+        await asyncio.sleep(retry_delay)
+
+
+async def input_task(estado):
+    """Read DS4 events and drive the motors; handles reconnection."""
+    while True:
+        dev = await esperar_ds4_async(DS4_PATH)
+
+        try:
+            dev.grab()
+            filter_input(dev)
+            print("DS4 ready — reading events (asyncio)...")
+            if latency is not None:
+                latency.use_device_clock(dev.fd)
+            # Forget stale input from the previous connection
+            estado.reset()
+
+            if raw_reader is not None:
+                await raw_reader.async_read_loop(
+                    dev.fd, functools.partial(handle_input_event, estado),
+                    functools.partial(catch_up_input, estado) if CATCH_UP else None,
+                    functools.partial(handle_stale_event, estado))
+            else:
+                async for event in dev.async_read_loop():
+                    handle_input_event(estado, event.type, event.code, event.value,
+                                       event.sec, event.usec)
+
+        except OSError as e:
+            print(f"\n[DS4] Controller disconnected: {e}")
+            release_controls(estado)
+            print("[DS4] Waiting for reconnection...")
+            await asyncio.sleep(reconnect_delay(DS4_PATH))
+
+        finally:
+            unfilter_input()
+            try:
+                dev.ungrab()
+            except Exception:
+                pass
+
+
+async def oled_task(executor):
+    """Redraw the face when 'is_moving' changes; I2C runs in 'executor'."""
+    loop = asyncio.get_running_loop()
+    last_state = None
+
+    while True:
+        if oled_device is None:
+            await asyncio.sleep(0.5)
+            continue
+
+        current = "angry" if is_moving else "happy"
+
+        if current != last_state:
+            try:
+                await loop.run_in_executor(executor, oled_draw_face, current)
+                last_state = current
+            except Exception as e:
+                print(f"[OLED] Draw error: {e}")
+                await asyncio.sleep(0.5)
+                continue
+
+        await asyncio.sleep(0.1)  # limit update rate
+
+
+async def power_task(estado, wake):
+    """Check the SHARE + OPTIONS combo whenever one of them changes."""
+    loop = asyncio.get_running_loop()
+
+    while True:
+        await wake.wait()
+        wake.clear()
+        # os.system blocks until 'shutdown' returns → keep it off the loop
+        await loop.run_in_executor(None, check_shutdown_combo, estado)
+
+
+async def main_async():
+    """
+    asyncio runtime: input, OLED and the shutdown check run as tasks on
+    one loop. Motor writes happen inline in the input task, while I2C
+    transfers run in an executor thread and DFPlayer actions on the
+    AudioWorker thread, so they never delay the next motor update.
+    """
+    global is_moving, dispatch_power
+
+    estado = ControllerState()
+    power_wake = asyncio.Event()
+
+    def post_power(_estado):
+        power_wake.set()
+
+    dispatch_power = post_power
+
+    setup_motors()
+    start_control_ticker(CONTROL_RATE_HZ)
+    start_audio()
+    start_deadman(DEADMAN_MS)
+    init_oled()
+    is_moving = False
+
+    oled_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="oled")
+
+    tasks = [
+        asyncio.create_task(input_task(estado)),
+        asyncio.create_task(oled_task(oled_executor)),
+        asyncio.create_task(power_task(estado, power_wake)),
+    ]
+
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        oled_executor.shutdown(wait=True)
+        dispatch_power = check_shutdown_combo
+        shutdown_runtime()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="DS4-controlled mecanum car")
+    parser.add_argument(
+        "--runtime", choices=("threaded", "asyncio"), default="threaded",
+        help="threaded: blocking read loop + OLED thread (default); "
+             "asyncio: input, display and shutdown check as tasks"
+    )
+    parser.add_argument(
+        "--ds4-path", default=DS4_PATH,
+        help="fixed event node (e.g. /dev/input/event4) instead of hotplug discovery"
+    )
+    parser.add_argument(
+        "--backend", choices=sorted(BACKENDS), default=MOTOR_BACKEND,
+        help="motor driver: rpigpio (software PWM), pigpio (hardware PWM "
+             "at 20 kHz), gpiomem (IN pins via mmap'd registers), gpiod "
+             "(GPIO character device, EN pins on/off) or sim (records "
+             "commands, no hardware)"
+    )
+    parser.add_argument(
+        "--input", choices=("evdev", "raw"), default=INPUT_READER,
+        help="evdev: python-evdev read_loop (default); raw: read input_event "
+             "records in batches into a reusable buffer, no per-event objects"
+    )
+    parser.add_argument(
+        "--catch-up", action="store_true", default=CATCH_UP,
+        help="when input piles up, skip the stale stick/trigger positions and "
+             "act on the controller's current state; button presses are kept "
+             "(implies --input raw)"
+    )
+    parser.add_argument(
+        "--no-input-filter", dest="input_filter", action="store_false",
+        default=INPUT_FILTER,
+        help="do not set stick fuzz/flat or event masks on the DS4 node "
+             "(every jitter reaches the program)"
+    )
+    parser.add_argument(
+        "--drive", choices=["tank", "mecanum"], default=DRIVE_MODE,
+        help="tank: one stick per side, triggers strafe (priority); mecanum: "
+             "sticks and triggers mixed so strafe, drive and turn combine "
+             "(needs a PWM per wheel: not with pigpio or --pwm hw)"
+    )
+    parser.add_argument(
+        "--pwm", choices=["soft", "hw"], default=PWM_MODE,
+        help="EN pins: soft (RPi.GPIO PWM threads) or hw (SoC PWM channels "
+             "through /sys/class/pwm, GPIO12/18 and 13/19 share a channel)"
+    )
+    parser.add_argument(
+        "--gpiochip", default=GPIOCHIP_PATH, metavar="PATH",
+        help="gpiod backend: GPIO chip device (a gpio-sim/gpio-mockup chip "
+             "works for testing)"
+    )
+    parser.add_argument(
+        "--sim-log", metavar="PATH",
+        help="sim backend: save every motor command as CSV at exit"
+    )
+    parser.add_argument(
+        "--latency", action="store_true",
+        help="measure kernel-event → PWM-write latency (SIGUSR1 prints it)"
+    )
+    parser.add_argument(
+        "--latency-report", metavar="PATH",
+        help="also write the latency histograms to PATH at shutdown"
+    )
+    parser.add_argument(
+        "--record", metavar="PATH",
+        help="record the raw DS4 event stream to PATH"
+    )
+    parser.add_argument(
+        "--replay", metavar="PATH",
+        help="feed a recording through the input pipeline instead of the DS4"
+    )
+    parser.add_argument(
+        "--replay-speed", type=float, default=REPLAY_SPEED, metavar="X",
+        help="replay speed factor (1 = real time, 0 = as fast as possible)"
+    )
+    parser.add_argument(
+        "--control-rate", type=float, default=CONTROL_RATE_HZ, metavar="HZ",
+        help="run motor control at a fixed rate, e.g. 200 (0 = once per input frame)"
+    )
+    parser.add_argument(
+        "--deadman", type=float, default=DEADMAN_MS, metavar="MS",
+        help="stop the motors after this long without controller input "
+             "(0 = off)"
+    )
+    parser.add_argument(
+        "--stop", choices=STOP_STRATEGIES, default=STOP_MODE,
+        help="how released wheels stop: coast, brake (active brake) or "
+             "brake_then_coast (default: STOP_MODES of the drive mode)"
+    )
+    parser.add_argument(
+        "--brake-ms", type=float, default=BRAKE_MS, metavar="MS",
+        help="brake_then_coast: brake time before coasting"
+    )
+    parser.add_argument(
+        "--actuator-thread", action="store_true", default=ACTUATOR_THREAD,
+        help="apply motor commands on a dedicated thread (latest command wins), "
+             "so a slow backend never blocks input"
+    )
+    parser.add_argument(
+        "--ramp-accel", type=float, default=RAMP_ACCEL, metavar="PCT_PER_MS",
+        help="limit duty increase per ms, in %% of full duty (e.g. 0.2 → 0-100%% "
+             "in 500 ms); 0 = no limit"
+    )
+    parser.add_argument(
+        "--ramp-decel", type=float, default=RAMP_DECEL, metavar="PCT_PER_MS",
+        help="limit duty decrease per ms, in %% of full duty; 0 = no limit"
+    )
+    return parser.parse_args()
 
 
 # ======================================================
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    DS4_PATH = args.ds4_path
+    CONTROL_RATE_HZ = args.control_rate
+    DEADMAN_MS = args.deadman
+    ACTUATOR_THREAD = args.actuator_thread
+    RAMP_ACCEL = args.ramp_accel
+    RAMP_DECEL = args.ramp_decel
+    LATENCY_REPORT_PATH = args.latency_report
+    MOTOR_BACKEND = args.backend
+    SIM_LOG_PATH = args.sim_log
+    GPIOCHIP_PATH = args.gpiochip
+    PWM_MODE = args.pwm
+    DRIVE_MODE = args.drive
+    STOP_MODE = args.stop
+    BRAKE_MS = args.brake_ms
+    if CONTROL_RATE_HZ < RAMP_RATE_HZ:
+        if RAMP_ACCEL > 0 or RAMP_DECEL > 0:
+            print(f"[RAMP] Duty ramps need the control tick: running it at {RAMP_RATE_HZ} Hz")
+            CONTROL_RATE_HZ = RAMP_RATE_HZ
+        elif stop_strategy() == STOP_BRAKE_THEN_COAST:
+            print(f"[WHEELS] Timed brakes need the control tick: running it at {RAMP_RATE_HZ} Hz")
+            CONTROL_RATE_HZ = RAMP_RATE_HZ
+    if args.latency or args.latency_report:
+        enable_latency()
+    INPUT_READER = args.input
+    CATCH_UP = args.catch_up
+    if CATCH_UP and INPUT_READER != "raw":
+        print("[INPUT] Catch-up needs the raw reader: using --input raw")
+        INPUT_READER = "raw"
+    INPUT_FILTER = args.input_filter
+    if INPUT_READER == "raw":
+        raw_reader = RawEventReader()
+    RECORD_PATH = args.record
+    REPLAY_PATH = args.replay
+    REPLAY_SPEED = args.replay_speed
+    if RECORD_PATH is not None:
+        recorder = InputRecorder(RECORD_PATH)
+
+    if args.runtime == "asyncio" and REPLAY_PATH is not None:
+        print("[REPLAY] Replay runs on the threaded runtime")
+        args.runtime = "threaded"
+
+    if args.runtime == "asyncio":
+        try:
+            asyncio.run(main_async())
+        except KeyboardInterrupt:
+            print("\n[Ctrl+C] Exiting...")
+    else:
+        main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Mecanum inverse kinematics: body velocity → four signed wheel duties.
+
+The controller gives a body velocity
+    vx     forward   (average of the two sticks, like tank drive)
+    vy     left      (L2 strafes left, R2 right; both cancel out)
+    omega  rotation  (counter-clockwise, half the stick difference)
+which goes through the 4×3 mecanum matrix (X-configured rollers):
+
+    FL = vx - vy - omega        FR = vx + vy + omega
+    RL = vx + vy - omega        RR = vx - vy + omega
+
+If any wheel exceeds full scale all four are scaled down together, so
+the direction of motion is kept and only the speed saturates.
+
+Everything runs on integers in FIXED_ONE units with the lookup tables
+from curves.py, so a control step does no float math and no allocation.
+mix_batch() evaluates whole arrays of recorded inputs at once (NumPy
+when installed, plain Python otherwise) for offline checks and benchmarks.
+"""
+from curves import (
+    FIXED_ONE, PERCENT, magnitude_table, stick_fixed_table, trigger_fixed_table,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Rows: wheels in WHEELS order. Columns: vx, vy, omega.
+MECANUM = (
+    (1, -1, -1),
+    (1, 1, 1),
+    (1, 1, -1),
+    (1, -1, 1),
+)
+
+
+class MecanumMixer:
+    """Raw DS4 axes → signed wheel duties (FL, FR, RL, RR) in one duty scale."""
+
+    def __init__(self, scale=PERCENT, stick_expo=0.0, trigger_expo=0.0):
+        self.scale = scale
+        self.stick = stick_fixed_table(stick_expo)
+        self.trigger = trigger_fixed_table(trigger_expo)
+        self.duty = magnitude_table(scale)
+        self.out = [0, 0, 0, 0]     # reused by every mix() call
+        self.mixes = 0
+        self.saturated = 0          # mixes that had to be scaled down
+
+    def body(self, ly, ry, l2, r2):
+        """Body velocity (vx, vy, omega) in FIXED_ONE units from raw axes."""
+        left = self.stick[ly]
+        right = self.stick[ry]
+        return ((left + right) >> 1,
+                self.trigger[l2] - self.trigger[r2],
+                (right - left) >> 1)
+
+    def mix(self, vx, vy, omega):
+        """
+        Signed wheel duties for a body velocity, > 0 forward. Returns the
+        shared 'out' list: copy it if it must outlive the next call.
+        """
+        out = self.out
+        duty = self.duty
+        self.mixes += 1
+
+        fl = vx - vy - omega
+        fr = vx + vy + omega
+        rl = vx + vy - omega
+        rr = vx - vy + omega
+
+        peak = max(abs(fl), abs(fr), abs(rl), abs(rr))
+        if peak > FIXED_ONE:
+            self.saturated += 1
+            fl = fl * FIXED_ONE // peak
+            fr = fr * FIXED_ONE // peak
+            rl = rl * FIXED_ONE // peak
+            rr = rr * FIXED_ONE // peak
+
+        out[0] = duty[fl] if fl >= 0 else -duty[-fl]
+        out[1] = duty[fr] if fr >= 0 else -duty[-fr]
+        out[2] = duty[rl] if rl >= 0 else -duty[-rl]
+        out[3] = duty[rr] if rr >= 0 else -duty[-rr]
+        return out
+
+    def mix_controls(self, ly, ry, l2, r2):
+        """mix() straight from raw axis values."""
+        vx, vy, omega = self.body(ly, ry, l2, r2)
+        return self.mix(vx, vy, omega)
+
+    def mix_batch(self, ly, ry, l2, r2):
+        """
+        Wheel duties for sequences of raw axis values: one row per sample,
+        columns in WHEELS order. Returns an (N, 4) array with NumPy, a list
+        of tuples without it; both match mix_controls() sample by sample.
+        """
+        if np is None:
+            rows = []
+            for sample in zip(ly, ry, l2, r2):
+                rows.append(tuple(self.mix_controls(*sample)))
+            return rows
+
+        stick = np.asarray(self.stick, dtype=np.int64)
+        trigger = np.asarray(self.trigger, dtype=np.int64)
+        left = stick[np.asarray(ly, dtype=np.intp)]
+        right = stick[np.asarray(ry, dtype=np.intp)]
+        body = np.stack([
+            (left + right) >> 1,
+            trigger[np.asarray(l2, dtype=np.intp)] - trigger[np.asarray(r2, dtype=np.intp)],
+            (right - left) >> 1,
+        ], axis=1)
+
+        wheels = body @ np.asarray(MECANUM, dtype=np.int64).T
+        peak = np.abs(wheels).max(axis=1, keepdims=True)
+        over = peak > FIXED_ONE
+        wheels = np.where(over, wheels * FIXED_ONE // np.where(over, peak, 1), wheels)
+        self.mixes += len(wheels)
+        self.saturated += int(over.sum())
+
+        duty = np.asarray(self.duty)
+        return np.sign(wheels) * duty[np.abs(wheels)]
+
+    def report(self):
+        if self.mixes:
+            print(f"[MIXER] {self.mixes} mixes, {self.saturated} scaled down "
+                  f"to full scale ({100 * self.saturated / self.mixes:.1f}%)")
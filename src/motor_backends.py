@@ -0,0 +1,690 @@
+#!/usr/bin/env python3
+"""
+Motor driver backends for the two L298N boards.
+
+Every backend exposes the same small interface, so the control code in
+main.py is written once:
+
+    setup()                 configure IN pins as outputs and start PWM at 0
+    write(pin, level)       set one IN (direction) pin to 0/1
+    compile_bank(set, clr)  precompute a bank write from set/clear bitmasks
+    write_bank(compiled)    apply a compiled bank write in one operation
+    set_duty(pin, duty)     set the duty of one EN pin, in 'duty_scale' units
+    cleanup()               release the hardware
+
+Backends:
+- rpigpio: RPi.GPIO outputs + software PWM (duty 0–100)
+- pigpio:  pigpiod outputs + hardware PWM at 20 kHz (duty 0–1_000_000)
+- gpiomem: IN pins written straight into the BCM2711 GPSET/GPCLR registers
+           through an mmap of /dev/gpiomem; EN duty handled by another backend
+- gpiod:   GPIO character device (/dev/gpiochipN) through libgpiod, all
+           lines in one bulk request and bank writes as one set_values ioctl
+- sim:     in-memory simulator that records every command with a timestamp
+
+rpigpio, gpiomem and gpiod accept a 'duty_backend' for the EN pins;
+SysfsPWM drives them from the SoC's hardware PWM through /sys/class/pwm.
+
+Bank writes always clear before they set, so an H-bridge input pair
+passes through "both low" (coast) and never through a half-updated
+"both high" state while the direction changes.
+
+MotorOutputs sits on top of a backend and skips writes that would not
+change anything (shadow registers).
+"""
+import mmap
+import os
+import time
+
+from curves import PERCENT, PIGPIO
+
+SOFT_PWM_FREQ = 1000      # Hz, RPi.GPIO software PWM
+HW_PWM_FREQ = 20000       # Hz, pigpio hardware PWM
+
+
+def mask_pins(mask):
+    """BCM pin numbers of the bits set in 'mask'."""
+    return [pin for pin in range(32) if (mask >> pin) & 1]
+
+
+# ======================================================
+#                       RPi.GPIO
+# ======================================================
+
+class RPiGPIOBackend:
+    """RPi.GPIO outputs and one software PWM thread per EN pin."""
+
+    name = "rpigpio"
+    duty_scale = PERCENT
+
+    def __init__(self, dir_pins, pwm_pins, freq=SOFT_PWM_FREQ, duty_backend=None):
+        self.dir_pins = list(dir_pins)
+        self.pwm_pins = list(pwm_pins)
+        self.freq = freq
+        self.duty_backend = duty_backend
+        self.duty_scale = duty_backend.duty_scale if duty_backend else PERCENT
+        self.GPIO = None
+        self.pwms = {}
+
+    def setup(self):
+        import RPi.GPIO as GPIO
+
+        self.GPIO = GPIO
+        GPIO.setmode(GPIO.BCM)
+
+        if self.duty_backend is not None:
+            # EN pins belong to the duty backend: no software PWM threads
+            for pin in self.dir_pins:
+                GPIO.setup(pin, GPIO.OUT)
+            self.duty_backend.setup()
+            return
+
+        # Set all pins as OUTPUT
+        for pin in self.dir_pins + self.pwm_pins:
+            GPIO.setup(pin, GPIO.OUT)
+
+        # Initialize PWM objects
+        for pin in self.pwm_pins:
+            pwm = GPIO.PWM(pin, self.freq)
+            pwm.start(0)
+            self.pwms[pin] = pwm
+
+    def write(self, pin, level):
+        self.GPIO.output(pin, level)
+
+    def compile_bank(self, set_mask, clear_mask):
+        # One GPIO.output(list, list) call; cleared pins come first
+        clear = mask_pins(clear_mask)
+        sets = mask_pins(set_mask)
+        return clear + sets, [0] * len(clear) + [1] * len(sets)
+
+    def write_bank(self, compiled):
+        self.GPIO.output(*compiled)
+
+    def set_duty(self, pin, duty):
+        if self.duty_backend is not None:
+            self.duty_backend.set_duty(pin, duty)
+        else:
+            self.pwms[pin].ChangeDutyCycle(duty)
+
+    def cleanup(self):
+        if self.duty_backend is not None:
+            self.duty_backend.cleanup()
+        for pwm in self.pwms.values():
+            pwm.stop()
+        self.pwms = {}
+        self.GPIO.cleanup()
+
+
+# ======================================================
+#                    HARDWARE PWM
+# ======================================================
+#
+# The BCM2711 has one PWM block (pwmchip0 in sysfs) with two channels, each
+# available on two header pins:
+#
+#   channel 0 (PWM0_0): GPIO12 (ALT0) and GPIO18 (ALT5)  -> R_ENB, R_ENA
+#   channel 1 (PWM0_1): GPIO13 (ALT0) and GPIO19 (ALT5)  -> L_ENA, L_ENB
+#
+# Both pins of a channel always output the same duty. The wiring puts the
+# two EN pins of one side on the same channel, so tank and lateral moves
+# (same duty per side) lose nothing.
+#
+# The pins must be muxed to their PWM function before use, e.g. with the
+# overlay in /boot/firmware/config.txt:
+#
+#   dtoverlay=pwm-2chan,pin=18,func=2,pin2=19,func2=2
+#
+# plus, for the second pin of each channel (the overlay muxes only one):
+#
+#   raspi-gpio set 12 a0      (or: pinctrl set 12 a0)
+#   raspi-gpio set 13 a0
+
+HW_PWM_CHANNELS = {12: 0, 18: 0, 13: 1, 19: 1}
+PWMCHIP_PATH = "/sys/class/pwm/pwmchip0"
+
+
+class PWMChannelPairs:
+    """
+    Folds per-pin duties onto the two hardware PWM channels.
+
+    A channel outputs the highest duty requested by its pins. Writing a pin
+    so that it disagrees with its partner right after another write that
+    also left them disagreeing counts as a conflict; the two pins of a
+    side updated back to back with the same duty never do.
+    """
+
+    def __init__(self, pins):
+        bad = [pin for pin in pins if pin not in HW_PWM_CHANNELS]
+        if bad:
+            raise ValueError(f"GPIO {bad} have no hardware PWM channel "
+                             f"(use {sorted(HW_PWM_CHANNELS)})")
+        self.channel = {pin: HW_PWM_CHANNELS[pin] for pin in pins}
+        self.members = {}
+        for pin in pins:
+            self.members.setdefault(self.channel[pin], []).append(pin)
+        self.duties = dict.fromkeys(pins, 0)
+        self.split = dict.fromkeys(self.members, False)
+        self.conflicts = 0
+
+    def update(self, pin, duty):
+        """Store the duty of 'pin' and return (channel, channel duty)."""
+        self.duties[pin] = duty
+        ch = self.channel[pin]
+        out = 0
+        split = False
+        for other in self.members[ch]:
+            d = self.duties[other]
+            if d != duty:
+                split = True
+            if d > out:
+                out = d
+        if split and self.split[ch]:
+            self.conflicts += 1
+        self.split[ch] = split
+        return ch, out
+
+    def report(self, tag):
+        if self.conflicts:
+            print(f"[{tag}] {self.conflicts} duty conflicts between pins "
+                  f"sharing a PWM channel (the higher duty was used)")
+
+
+class SysfsPWM:
+    """
+    EN duty from the hardware PWM block through /sys/class/pwm: no thread
+    and no CPU time once a duty is set. Used as 'duty_backend' by the
+    other backends; duty in percent (0–100).
+
+    Channel duties only reach sysfs when they change, through duty_cycle
+    files kept open for the whole run.
+    """
+
+    duty_scale = PERCENT
+
+    def __init__(self, pwm_pins, freq=HW_PWM_FREQ, chip_path=PWMCHIP_PATH):
+        self.dir_pins = []
+        self.pwm_pins = list(pwm_pins)
+        self.freq = freq
+        self.chip_path = chip_path
+        self.period_ns = int(1_000_000_000 / freq)
+        self.pairs = PWMChannelPairs(self.pwm_pins)
+        self.fds = {}           # channel -> open duty_cycle fd
+        self.written = {}       # channel -> last duty_cycle (ns)
+        self.exported = []
+
+    def _attr(self, ch, attr):
+        return os.path.join(self.chip_path, f"pwm{ch}", attr)
+
+    def _write(self, path, value):
+        with open(path, "w") as f:
+            f.write(str(value))
+
+    def setup(self):
+        for ch in sorted(self.pairs.members):
+            if not os.path.exists(self._attr(ch, "enable")):
+                self._write(os.path.join(self.chip_path, "export"), ch)
+                self.exported.append(ch)
+                # udev may still be fixing the permissions of the new files
+                for _ in range(100):
+                    if os.access(self._attr(ch, "enable"), os.W_OK):
+                        break
+                    time.sleep(0.01)
+
+            self._write(self._attr(ch, "duty_cycle"), 0)
+            self._write(self._attr(ch, "period"), self.period_ns)
+            self._write(self._attr(ch, "enable"), 1)
+            self.fds[ch] = os.open(self._attr(ch, "duty_cycle"), os.O_WRONLY)
+            self.written[ch] = 0
+        print(f"[HWPWM] Channels {sorted(self.fds)} at {self.freq} Hz "
+              f"on {self.chip_path}")
+
+    def set_duty(self, pin, duty):
+        ch, out = self.pairs.update(pin, duty)
+        # Percent duties are floats (tables, ramp); sysfs only takes integers
+        value = int(self.period_ns * out / 100)
+        if value != self.written[ch]:
+            os.pwrite(self.fds[ch], str(value).encode(), 0)
+            self.written[ch] = value
+
+    def cleanup(self):
+        self.pairs.report("HWPWM")
+        for ch, fd in self.fds.items():
+            os.pwrite(fd, b"0", 0)
+            os.close(fd)
+            self._write(self._attr(ch, "enable"), 0)
+        self.fds = {}
+        for ch in self.exported:
+            self._write(os.path.join(self.chip_path, "unexport"), ch)
+        self.exported = []
+
+
+# ======================================================
+#                        PIGPIO
+# ======================================================
+
+class PigpioBackend:
+    """
+    pigpiod outputs and hardware PWM on the EN pins. Pins sharing a PWM
+    channel are folded with PWMChannelPairs instead of letting the last
+    hardware_PWM() call win.
+    """
+
+    name = "pigpio"
+    duty_scale = PIGPIO
+
+    def __init__(self, dir_pins, pwm_pins, freq=HW_PWM_FREQ):
+        self.dir_pins = list(dir_pins)
+        self.pwm_pins = list(pwm_pins)
+        self.freq = freq
+        self.pairs = PWMChannelPairs(self.pwm_pins)
+        self.channel_duty = {}
+        self.pi = None
+
+    def setup(self):
+        import pigpio
+
+        self.pi = pigpio.pi()
+        if not self.pi.connected:
+            raise RuntimeError("Unable to connect to pigpiod. Is the service running?")
+
+        for pin in self.dir_pins:
+            self.pi.set_mode(pin, pigpio.OUTPUT)
+            self.pi.write(pin, 0)
+
+        for pin in self.pwm_pins:
+            self.pi.hardware_PWM(pin, self.freq, 0)
+        self.channel_duty = dict.fromkeys(self.pairs.members, 0)
+
+    def write(self, pin, level):
+        self.pi.write(pin, level)
+
+    def compile_bank(self, set_mask, clear_mask):
+        return set_mask, clear_mask
+
+    def write_bank(self, compiled):
+        # GPCLR0 then GPSET0: each one is a single register write
+        set_mask, clear_mask = compiled
+        if clear_mask:
+            self.pi.clear_bank_1(clear_mask)
+        if set_mask:
+            self.pi.set_bank_1(set_mask)
+
+    def set_duty(self, pin, duty):
+        ch, out = self.pairs.update(pin, duty)
+        if out != self.channel_duty[ch]:
+            self.pi.hardware_PWM(pin, self.freq, out)
+            self.channel_duty[ch] = out
+
+    def cleanup(self):
+        self.pairs.report("PIGPIO")
+        for pin in self.pwm_pins:
+            self.pi.hardware_PWM(pin, self.freq, 0)
+        for pin in self.dir_pins:
+            self.pi.write(pin, 0)
+        self.pi.stop()
+
+
+# ======================================================
+#                      SIMULATOR
+# ======================================================
+
+class SimBackend:
+    """
+    Simulated driver: keeps the current pin state and a log of every
+    command as (monotonic_ns, op, pin, value), with op "write" or "duty".
+    Bank writes are logged as (monotonic_ns, "bank", set_mask, clear_mask).
+    """
+
+    name = "sim"
+    duty_scale = PERCENT
+
+    def __init__(self, dir_pins, pwm_pins, log_path=None):
+        self.dir_pins = list(dir_pins)
+        self.pwm_pins = list(pwm_pins)
+        self.log_path = log_path
+        self.levels = {}
+        self.duties = {}
+        self.log = []
+
+    def setup(self):
+        for pin in self.dir_pins:
+            self.levels[pin] = 0
+        for pin in self.pwm_pins:
+            self.duties[pin] = 0
+
+    def write(self, pin, level):
+        self.levels[pin] = level
+        self.log.append((time.monotonic_ns(), "write", pin, level))
+
+    def compile_bank(self, set_mask, clear_mask):
+        return set_mask, clear_mask, mask_pins(set_mask), mask_pins(clear_mask)
+
+    def write_bank(self, compiled):
+        set_mask, clear_mask, sets, clears = compiled
+        for pin in clears:
+            self.levels[pin] = 0
+        for pin in sets:
+            self.levels[pin] = 1
+        self.log.append((time.monotonic_ns(), "bank", set_mask, clear_mask))
+
+    def set_duty(self, pin, duty):
+        self.duties[pin] = duty
+        self.log.append((time.monotonic_ns(), "duty", pin, duty))
+
+    def save(self, path):
+        with open(path, "w") as f:
+            f.write("t_ns,op,pin,value\n")
+            for t, op, pin, value in self.log:
+                f.write(f"{t},{op},{pin},{value}\n")
+        print(f"[SIM] {len(self.log)} commands saved to {path}")
+
+    def cleanup(self):
+        print(f"[SIM] {len(self.log)} motor commands recorded")
+        if self.log_path is not None:
+            self.save(self.log_path)
+
+
+# ======================================================
+#                    /dev/gpiomem
+# ======================================================
+
+GPIOMEM_PATH = "/dev/gpiomem"
+GPIO_BLOCK_SIZE = 4096
+
+# BCM2711 GPIO register offsets (bytes)
+GPFSEL0 = 0x00
+GPSET0 = 0x1C
+GPCLR0 = 0x28
+GPLEV0 = 0x34
+
+FSEL_INPUT = 0b000
+FSEL_OUTPUT = 0b001
+
+
+class GpiomemBackend:
+    """
+    IN pins driven by writing GPSET0/GPCLR0 directly through a memoryview
+    over the GPIO register block: no syscall and no C-extension call per
+    write, and a bank write really is one register store per direction.
+
+    /dev/gpiomem does not expose the PWM block, so EN duty is delegated to
+    'duty_backend' (RPi.GPIO software PWM by default).
+
+    'regs' injects the register map: any writable buffer of at least
+    GPIO_BLOCK_SIZE bytes, e.g. an mmap of an ordinary file, so the
+    backend can be exercised on a machine without /dev/gpiomem.
+    """
+
+    name = "gpiomem"
+
+    def __init__(self, dir_pins, pwm_pins, regs=None, duty_backend=None,
+                 path=GPIOMEM_PATH):
+        self.dir_pins = list(dir_pins)
+        self.pwm_pins = list(pwm_pins)
+        self.path = path
+        self.duty_backend = duty_backend or RPiGPIOBackend([], pwm_pins)
+        self.duty_scale = self.duty_backend.duty_scale
+        self._buffer = regs
+        self._mm = None
+        self.regs = None
+        self._set = GPSET0 // 4
+        self._clr = GPCLR0 // 4
+
+    def setup(self):
+        if self._buffer is None:
+            fd = os.open(self.path, os.O_RDWR | os.O_SYNC)
+            try:
+                self._mm = mmap.mmap(fd, GPIO_BLOCK_SIZE, mmap.MAP_SHARED,
+                                     mmap.PROT_READ | mmap.PROT_WRITE)
+            finally:
+                os.close(fd)
+            self._buffer = self._mm
+        self.regs = memoryview(self._buffer).cast("I")
+
+        self.regs[self._clr] = self._mask(self.dir_pins)
+        for pin in self.dir_pins:
+            self._set_function(pin, FSEL_OUTPUT)
+
+        self.duty_backend.setup()
+
+    def _mask(self, pins):
+        mask = 0
+        for pin in pins:
+            mask |= 1 << pin
+        return mask
+
+    def _set_function(self, pin, function):
+        reg = GPFSEL0 // 4 + pin // 10
+        shift = (pin % 10) * 3
+        self.regs[reg] = (self.regs[reg] & ~(0b111 << shift)) | (function << shift)
+
+    def write(self, pin, level):
+        self.regs[self._set if level else self._clr] = 1 << pin
+
+    def compile_bank(self, set_mask, clear_mask):
+        return set_mask, clear_mask
+
+    def write_bank(self, compiled):
+        set_mask, clear_mask = compiled
+        if clear_mask:
+            self.regs[self._clr] = clear_mask
+        if set_mask:
+            self.regs[self._set] = set_mask
+
+    def set_duty(self, pin, duty):
+        self.duty_backend.set_duty(pin, duty)
+
+    def cleanup(self):
+        self.duty_backend.cleanup()
+        if self.regs is None:
+            return
+        # Same end state as GPIO.cleanup(): pins low and back to inputs
+        self.regs[self._clr] = self._mask(self.dir_pins)
+        for pin in self.dir_pins:
+            self._set_function(pin, FSEL_INPUT)
+        self.regs.release()
+        self.regs = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+            self._buffer = None
+
+
+# ======================================================
+#                  LIBGPIOD (CHARACTER DEVICE)
+# ======================================================
+
+GPIOCHIP_PATH = "/dev/gpiochip0"
+GPIOD_CONSUMER = "raspberry_car"
+
+
+class GpiodBackend:
+    """
+    Motor pins through the GPIO character device with libgpiod (v2 Python
+    bindings), instead of the deprecated sysfs interface RPi.GPIO relies on.
+
+    All lines are requested as outputs in a single bulk request, and every
+    bank write is a single set_values() ioctl. Without 'duty_backend' the EN
+    lines are part of the bulk request too and are driven on/off (no speed
+    control); pass a PWM-capable backend to keep proportional duty.
+
+    'chip_path' can point to a gpio-sim / gpio-mockup chip for testing.
+    """
+
+    name = "gpiod"
+
+    def __init__(self, dir_pins, pwm_pins, chip_path=GPIOCHIP_PATH,
+                 duty_backend=None):
+        self.dir_pins = list(dir_pins)
+        self.pwm_pins = list(pwm_pins)
+        self.chip_path = chip_path
+        self.duty_backend = duty_backend
+        self.duty_scale = duty_backend.duty_scale if duty_backend else PERCENT
+        self.request = None
+        self.setup_ns = 0
+        self._active = None
+        self._inactive = None
+
+    def setup(self):
+        import gpiod
+        from gpiod.line import Direction, Value
+
+        self._active = Value.ACTIVE
+        self._inactive = Value.INACTIVE
+        lines = list(self.dir_pins)
+        if self.duty_backend is None:
+            lines += self.pwm_pins
+            print("[GPIOD] No PWM backend: EN pins are driven fully on/off")
+
+        start = time.perf_counter_ns()
+        self.request = gpiod.request_lines(
+            self.chip_path,
+            consumer=GPIOD_CONSUMER,
+            config={tuple(lines): gpiod.LineSettings(direction=Direction.OUTPUT,
+                                                     output_value=Value.INACTIVE)},
+        )
+        self.setup_ns = time.perf_counter_ns() - start
+        print(f"[GPIOD] {len(lines)} lines requested on {self.chip_path} "
+              f"in {self.setup_ns / 1e6:.2f} ms")
+
+        if self.duty_backend is not None:
+            self.duty_backend.setup()
+
+    def write(self, pin, level):
+        self.request.set_value(pin, self._active if level else self._inactive)
+
+    def compile_bank(self, set_mask, clear_mask):
+        values = {pin: self._inactive for pin in mask_pins(clear_mask)}
+        values.update({pin: self._active for pin in mask_pins(set_mask)})
+        return values
+
+    def write_bank(self, compiled):
+        self.request.set_values(compiled)
+
+    def set_duty(self, pin, duty):
+        if self.duty_backend is not None:
+            self.duty_backend.set_duty(pin, duty)
+        else:
+            self.request.set_value(pin, self._active if duty > 0 else self._inactive)
+
+    def cleanup(self):
+        if self.duty_backend is not None:
+            self.duty_backend.cleanup()
+        if self.request is not None:
+            self.request.set_values({pin: self._inactive
+                                     for pin in self.request.offsets})
+            self.request.release()
+            self.request = None
+
+
+BACKENDS = {
+    RPiGPIOBackend.name: RPiGPIOBackend,
+    PigpioBackend.name: PigpioBackend,
+    GpiomemBackend.name: GpiomemBackend,
+    GpiodBackend.name: GpiodBackend,
+    SimBackend.name: SimBackend,
+}
+
+
+def create_backend(name, dir_pins, pwm_pins, **kwargs):
+    """Instantiate a backend by name (see BACKENDS)."""
+    try:
+        cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown motor backend: {name}") from None
+    return cls(dir_pins, pwm_pins, **kwargs)
+
+
+# ======================================================
+#                  MOTOR OUTPUT LAYER
+# ======================================================
+
+class DirectionPattern:
+    """
+    One drive mode (e.g. "left_forward") as set/clear bitmasks over the IN
+    pins it controls, plus the backend-specific compiled bank write.
+    """
+
+    __slots__ = ("name", "set_mask", "clear_mask", "mask", "compiled")
+
+    def __init__(self, name, levels, backend):
+        self.name = name
+        self.set_mask = 0
+        self.clear_mask = 0
+        for pin, level in levels.items():
+            if level:
+                self.set_mask |= 1 << pin
+            else:
+                self.clear_mask |= 1 << pin
+        self.mask = self.set_mask | self.clear_mask
+        self.compiled = backend.compile_bank(self.set_mask, self.clear_mask)
+
+
+class MotorOutputs:
+    """
+    Shadow registers for the motor pins.
+    Remembers the level of every IN pin (as one bit word) and the last duty
+    of every EN pin, and only calls the backend when something changes.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.bits = 0                               # IN pin levels
+        self.known = 0                              # IN pins with a known level
+        self.duties = dict.fromkeys(backend.pwm_pins)   # None = unknown
+        self.writes = 0
+        self.suppressed = 0
+        self.on_duty_write = None   # optional hook, called after each real duty write
+
+    def setup(self):
+        self.backend.setup()
+        # setup() starts every PWM at 0; IN levels stay unknown until written
+        for pin in self.duties:
+            self.duties[pin] = 0
+
+    def cleanup(self):
+        self.backend.cleanup()
+        self.bits = 0
+        self.known = 0
+        self.duties = dict.fromkeys(self.duties)
+
+    def pwm_channels(self):
+        """{EN pin: hardware PWM channel} when EN pins share channels, else None."""
+        pairs = getattr(self.backend, "pairs", None)
+        if pairs is None:
+            pairs = getattr(getattr(self.backend, "duty_backend", None), "pairs", None)
+        return None if pairs is None else dict(pairs.channel)
+
+    def compile_patterns(self, modes):
+        """Turn {mode: {pin: level}} into {mode: DirectionPattern} once, at startup."""
+        return {name: DirectionPattern(name, levels, self.backend)
+                for name, levels in modes.items()}
+
+    def direction(self, pattern):
+        """Apply a DirectionPattern in one bank write, unless already in place."""
+        mask = pattern.mask
+        if self.known & mask == mask and self.bits & mask == pattern.set_mask:
+            self.suppressed += 1
+            return
+        self.backend.write_bank(pattern.compiled)
+        self.bits = (self.bits & ~mask) | pattern.set_mask
+        self.known |= mask
+        self.writes += 1
+
+    def duty(self, pin, value):
+        """Set an EN pin duty, skipping the backend call if it did not change."""
+        if self.duties[pin] == value:
+            self.suppressed += 1
+            return
+        self.backend.set_duty(pin, value)
+        self.duties[pin] = value
+        self.writes += 1
+        if self.on_duty_write is not None:
+            self.on_duty_write()
+
+    def report(self):
+        total = self.writes + self.suppressed
+        if total == 0:
+            return
+        print(f"[MOTOR] {self.backend.name}: {self.writes} writes issued, "
+              f"{self.suppressed} suppressed ({100.0 * self.suppressed / total:.1f}% skipped)")
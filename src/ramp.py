@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Slew-rate limiter for the wheel duties (soft start).
+
+A full trigger press asks every wheel to go from 0 to full duty at once;
+the inrush current of four motors can brown out the Pi. The limiter sits
+between the control logic and the motor outputs and lets each wheel's
+duty move at most 'accel' (speeding up) or 'decel' (slowing down) per
+millisecond, in % of full scale. A wheel asked to reverse is first
+brought to 0 at the decel rate, then accelerated the other way.
+
+It must be stepped at a steady rate (the control tick) so ramps progress
+between input events. State lives in preallocated arrays: step() does
+not allocate.
+"""
+import time
+from array import array
+
+MAX_STEP_MS = 50.0   # longer gaps (stalls, first step) count as this much
+
+
+class SlewLimiter:
+    """Per-wheel duty ramps with separate acceleration / deceleration limits."""
+
+    def __init__(self, full_scale, accel, decel, wheels=4, integer=False):
+        # accel / decel in % of full scale per ms; 0 = unlimited
+        self.full_scale = full_scale
+        self.accel = accel * full_scale / 100.0 if accel > 0 else None
+        self.decel = decel * full_scale / 100.0 if decel > 0 else None
+        self.integer = integer
+
+        self.current = array("d", bytes(8 * wheels))
+        self.out = [0] * wheels
+        self.last_ns = None
+
+        self.steps = 0
+        self.clamps = 0           # wheel updates cut short by a limit
+        self.excess_sum = 0.0     # duty requested beyond the limit
+        self.excess_max = 0.0
+
+    def step(self, targets, now_ns=None):
+        """Move every wheel towards 'targets'; returns the shared 'out' list."""
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        if self.last_ns is not None:
+            dt_ms = (now_ns - self.last_ns) / 1e6
+            if dt_ms > MAX_STEP_MS:
+                dt_ms = MAX_STEP_MS
+        else:
+            dt_ms = 0.0
+        self.last_ns = now_ns
+        self.steps += 1
+
+        current = self.current
+        out = self.out
+        for i in range(len(out)):
+            cur = current[i]
+            tgt = targets[i]
+            if (cur > 0 > tgt) or (cur < 0 < tgt):
+                tgt = 0       # reversing: stop first
+            if tgt == cur:
+                continue
+
+            delta = tgt - cur
+            rate = self.accel if abs(tgt) > abs(cur) else self.decel
+            limit = None if rate is None else rate * dt_ms
+
+            if limit is None or -limit <= delta <= limit:
+                cur = tgt
+            else:
+                cur += limit if delta > 0 else -limit
+                excess = abs(delta) - limit
+                self.clamps += 1
+                self.excess_sum += excess
+                if excess > self.excess_max:
+                    self.excess_max = excess
+
+            current[i] = cur
+            out[i] = int(cur) if self.integer else cur
+        return out
+
+    def reset(self):
+        """Forget the ramp state: every wheel is at 0 now (e.g. after a hard stop)."""
+        for i in range(len(self.out)):
+            self.current[i] = 0.0
+            self.out[i] = 0
+        self.last_ns = None
+
+    def report(self):
+        if self.steps == 0:
+            return
+        updates = self.steps * len(self.out)
+        avg = self.excess_sum / self.clamps if self.clamps else 0.0
+        print(f"[RAMP] {self.steps} steps, {self.clamps} wheel updates clamped "
+              f"({100.0 * self.clamps / updates:.1f}%), excess avg "
+              f"{100.0 * avg / self.full_scale:.1f}% / max "
+              f"{100.0 * self.excess_max / self.full_scale:.1f}% of full scale")
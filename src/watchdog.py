@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Deadman watchdog for the motors.
+
+Input paths call feed() whenever the controller proves it is alive. A
+separate thread sleeps until the current deadline (last feed + deadline)
+and, if no feed arrived in between, calls 'on_trip' once. The next feed
+re-arms it.
+
+Every trip is recorded with
+- stop latency: last input → motors stopped (deadline + wake-up delay),
+  the real worst case of a lost controller, kept in a LatencyHistogram
+- silence: last input → input back (or program exit)
+"""
+import threading
+import time
+
+from latency import LatencyHistogram
+
+
+class Watchdog:
+    """Call 'on_trip()' when feed() has not been called for 'deadline_ms'."""
+
+    def __init__(self, deadline_ms, on_trip, active=None, name="deadman"):
+        # active(): optional check, trips only happen while it returns True
+        if deadline_ms <= 0:
+            raise ValueError("deadline_ms must be > 0")
+        self.deadline_ns = int(deadline_ms * 1_000_000)
+        self.on_trip = on_trip
+        self.active = active
+        self.name = name
+
+        self.last_ns = time.monotonic_ns()
+        self.tripped_at = None     # last_ns of the silence that tripped
+        self.trips = []            # (stop latency ns, silence ns) per trip
+        self.stop_latency = LatencyHistogram("input→deadman stop")
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def feed(self):
+        """Input is alive. Cheap: called for every frame / heartbeat."""
+        now = time.monotonic_ns()
+        self.last_ns = now
+        if self.tripped_at is not None:
+            self._recovered(now)
+
+    def _recovered(self, now):
+        tripped_at = self.tripped_at
+        if tripped_at is None:
+            return
+        self.tripped_at = None
+        silence = now - tripped_at
+        self.trips[-1] = (self.trips[-1][0], silence)
+        print(f"[WATCHDOG] Input back after {silence / 1e6:.1f} ms of silence")
+
+    def start(self):
+        self.last_ns = time.monotonic_ns()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        print(f"[WATCHDOG] Motors stop after {self.deadline_ns / 1e6:.0f} ms without input")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self.tripped_at is not None:
+            self._recovered(time.monotonic_ns())
+
+    def _run(self):
+        deadline = self.deadline_ns
+        while not self._stop.is_set():
+            last = self.last_ns
+            delay = last + deadline - time.monotonic_ns()
+            if delay > 0:
+                self._stop.wait(delay / 1e9)
+                continue
+
+            if self.tripped_at is None and (self.active is None or self.active()):
+                now = time.monotonic_ns()
+                try:
+                    self.on_trip()
+                except Exception as e:
+                    print(f"[WATCHDOG] Stop error: {e}")
+                stopped = time.monotonic_ns()
+                # Record first: a feed() that sees tripped_at updates trips[-1]
+                self.trips.append((stopped - last, now - last))
+                self.tripped_at = last
+                self.stop_latency.record(stopped - last)
+                print(f"[WATCHDOG] No input for {(now - last) / 1e6:.1f} ms → "
+                      f"motors stopped ({(stopped - last) / 1e6:.1f} ms after last input)")
+
+            # Tripped or idle: nothing to do until the next feed
+            self._stop.wait(deadline / 1e9)
+
+    def report(self):
+        if not self.trips:
+            print("[WATCHDOG] No trips")
+            return
+        longest = max(silence for _lat, silence in self.trips)
+        print(f"[WATCHDOG] {len(self.trips)} trips, longest silence {longest / 1e6:.1f} ms")
+        print("[WATCHDOG]   " + self.stop_latency.summary())
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Wheel-level motor commands for the four mecanum wheels.
+
+The two L298N boards drive each wheel independently: every wheel has its
+own IN pair and its own EN pin. WheelDrive keeps one signed duty per
+wheel (> 0 forward, < 0 backward, 0 stop) and pushes all four in a single
+apply step on top of MotorOutputs.
+
+How a wheel commanded to 0 stops is the stop strategy:
+- coast:            both IN low, EN off; the wheel rolls until friction stops it
+- brake:            both IN high with EN on; the L298N shorts the motor
+                    (active brake) for as long as the command stays 0
+- brake_then_coast: brake for 'brake_ms' after the wheel was driven, then coast
+
+A brake puts full duty on EN. When two EN pins share a hardware PWM
+channel (pigpio, --pwm hw) the channel outputs the higher duty of the
+pair, so braking one wheel would drive its partner at full speed: a
+wheel only brakes while its channel partner is not driven, else it coasts.
+"""
+import time
+
+WHEELS = ("FL", "FR", "RL", "RR")
+
+# State of one wheel, as a base-4 digit of the pattern index
+COAST, FORWARD, BACKWARD, BRAKE = 0, 1, 2, 3
+
+STOP_COAST = "coast"
+STOP_BRAKE = "brake"
+STOP_BRAKE_THEN_COAST = "brake_then_coast"
+STOP_STRATEGIES = (STOP_COAST, STOP_BRAKE, STOP_BRAKE_THEN_COAST)
+
+
+class WheelDrive:
+    """
+    {FL, FR, RL, RR}: signed duty, applied all at once.
+
+    'wheel_pins' maps each wheel to (IN pin high for forward, IN pin high
+    for backward, EN pin), so the direction mapping is per wheel. The IN
+    levels of all 4^4 coast/forward/backward/brake combinations are
+    compiled at startup, so apply() sets every direction bit in one bank
+    write and then writes only the EN duties that changed.
+
+    'trim' scales the duty of individual wheels (e.g. {"FR": 0.95}) to
+    even out motors that do not turn at the same speed.
+
+    With a 'ramp' (ramp.SlewLimiter) every apply() moves the wheels one
+    ramp step towards the command instead of jumping to it.
+
+    'stop' is the stop strategy; braking puts 'brake_duty' (full scale) on
+    EN. brake_then_coast relies on apply() being called regularly (the
+    control tick) to end each brake on time. With EN pins sharing PWM
+    channels (motor_out.pwm_channels()) a brake next to a driven channel
+    partner is turned into a coast.
+    """
+
+    def __init__(self, motor_out, wheel_pins, trim=None, ramp=None,
+                 stop=STOP_COAST, brake_duty=100, brake_ms=200):
+        if stop not in STOP_STRATEGIES:
+            raise ValueError(f"Unknown stop strategy: {stop}")
+        self.out = motor_out
+        self.ramp = ramp
+        self.stop_strategy = stop
+        self.brake_duty = brake_duty
+        self.brake_ns = int(brake_ms * 1_000_000)
+        self.en = [wheel_pins[wheel][2] for wheel in WHEELS]
+        trim = trim or {}
+        self.trim = [trim.get(wheel, 1.0) for wheel in WHEELS]
+        self.patterns = self._compile(wheel_pins)
+        self.partner = self._partners(motor_out.pwm_channels())
+
+        self.command = [0, 0, 0, 0]     # next command, WHEELS order
+        self.states = [COAST] * 4       # wheel states after the last apply
+        self.brake_until = [0] * 4      # brake_then_coast: end of each brake (ns)
+        self.en_duty = [0] * 4          # EN duties being applied
+        self.applied = [None] * 4       # last applied EN duty (None = unknown)
+        self.applied_dir = None         # last applied pattern index
+        self.applies = 0
+        self.skipped = 0                # EN updates skipped (unchanged)
+        self.brakes = 0                 # times a wheel entered the brake state
+        self.vetoed = 0                 # brakes turned into coasts (partner driven)
+
+    def _partners(self, channels):
+        """Index of the wheel sharing each wheel's PWM channel (None if alone)."""
+        partner = [None] * 4
+        if not channels:
+            return partner
+        for i in range(4):
+            for j in range(4):
+                if i != j and channels.get(self.en[i]) is not None and \
+                        channels.get(self.en[i]) == channels.get(self.en[j]):
+                    partner[i] = j
+        return partner
+
+    def _compile(self, wheel_pins):
+        modes = {}
+        for index in range(4 ** len(WHEELS)):
+            levels = {}
+            digits = index
+            for wheel in reversed(WHEELS):
+                state = digits % 4
+                digits //= 4
+                fwd, bwd, _en = wheel_pins[wheel]
+                levels[fwd] = 1 if state in (FORWARD, BRAKE) else 0
+                levels[bwd] = 1 if state in (BACKWARD, BRAKE) else 0
+            modes[index] = levels
+        patterns = self.out.compile_patterns(modes)
+        return [patterns[index] for index in range(len(patterns))]
+
+    def set(self, wheel, duty):
+        """Stage the duty of one wheel; nothing is written until apply()."""
+        self.command[WHEELS.index(wheel)] = duty
+
+    def drive(self, fl, fr, rl, rr):
+        """Stage and apply a full command in one step."""
+        cmd = self.command
+        cmd[0] = fl
+        cmd[1] = fr
+        cmd[2] = rl
+        cmd[3] = rr
+        self.apply()
+
+    def stop(self, immediate=False):
+        """All wheels to 0; 'immediate' skips the ramp (hard stop)."""
+        if immediate and self.ramp is not None:
+            self.ramp.reset()
+        self.drive(0, 0, 0, 0)
+
+    def settle(self):
+        """After stop(): wait out a timed brake so every wheel ends coasting."""
+        if self.stop_strategy != STOP_BRAKE_THEN_COAST or BRAKE not in self.states:
+            return
+        delay = max(self.brake_until) - time.monotonic_ns()
+        if delay > 0:
+            time.sleep(delay / 1e9)
+        self.apply()
+
+    @property
+    def moving(self):
+        """A wheel is commanded, or still powered: ramping down or braking."""
+        return any(self.command) or any(self.states)   # COAST is 0
+
+    def _zero_state(self, i):
+        """State of a wheel commanded to 0, according to the stop strategy."""
+        strategy = self.stop_strategy
+        if strategy == STOP_COAST:
+            return COAST
+        prev = self.states[i]
+        if prev == FORWARD or prev == BACKWARD:
+            self.brakes += 1
+            if strategy == STOP_BRAKE_THEN_COAST:
+                self.brake_until[i] = time.monotonic_ns() + self.brake_ns
+            return BRAKE
+        if prev == BRAKE and (strategy == STOP_BRAKE or
+                              time.monotonic_ns() < self.brake_until[i]):
+            return BRAKE
+        return COAST
+
+    def apply(self):
+        """Push the staged command: one bank write, then the changed EN duties."""
+        cmd = self.command
+        if self.ramp is not None:
+            cmd = self.ramp.step(cmd)
+        states = self.states
+        en_duty = self.en_duty
+        applied = self.applied
+        self.applies += 1
+
+        braking = False
+        for i in range(4):
+            d = cmd[i]
+            if d > 0:
+                state = FORWARD
+            elif d < 0:
+                state = BACKWARD
+                d = -d
+            else:
+                state = self._zero_state(i)
+                if state == BRAKE:
+                    d = self.brake_duty
+                    braking = True
+            if state != BRAKE:
+                t = self.trim[i]
+                if t != 1.0:
+                    d = type(d)(d * t)
+            states[i] = state
+            en_duty[i] = d
+
+        if braking:
+            # Full brake duty on a shared PWM channel would also drive the partner
+            partner = self.partner
+            for i in range(4):
+                p = partner[i]
+                if states[i] == BRAKE and p is not None and \
+                        (states[p] == FORWARD or states[p] == BACKWARD):
+                    states[i] = COAST
+                    en_duty[i] = 0
+                    self.vetoed += 1
+
+        index = ((states[0] * 4 + states[1]) * 4 + states[2]) * 4 + states[3]
+
+        if index != self.applied_dir:
+            self.out.direction(self.patterns[index])
+            self.applied_dir = index
+
+        for i in range(4):
+            d = en_duty[i]
+            if d == applied[i]:
+                self.skipped += 1
+                continue
+            applied[i] = d
+            self.out.duty(self.en[i], d)
+
+    def report(self):
+        total = 4 * self.applies
+        if total == 0:
+            return
+        print(f"[WHEELS] {self.applies} commands applied, {self.skipped} of "
+              f"{total} wheel updates skipped ({100.0 * self.skipped / total:.1f}%), "
+              f"stop: {self.stop_strategy}, {self.brakes} brakes")
+        if self.vetoed:
+            print(f"[WHEELS] {self.vetoed} wheel brakes replaced by coast: their "
+                  f"PWM channel partner was driven")